@@ -12,7 +12,10 @@ from PySide6.QtWidgets import (
 )
 
 from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QSize, QTimer
+import os
+import random
 import sys
+import time
 
 # ---------------- Dracula palette ----------------
 DRACULA = {
@@ -27,7 +30,26 @@ DRACULA = {
     "orange": "#ffb86c",
 }
 
-from layouts import PendulumPage, RandomPendulumData
+from layouts import (
+    PendulumPage,
+    GraphsPage,
+    RandomPendulumData,
+    MultiLinkPendulumData,
+    ROA_CONTROLLERS,
+    TelemetryServer,
+    ExperimentDB,
+    NpzTrajectoryWriter,
+)
+
+# Registro de experimentos: metadatos en SQLite, telemetría completa en NPZ
+EXPERIMENTS_DB = "experiments.sqlite"
+RUNS_DIR = "runs"
+ROA_CACHE_DIR = "roa_cache"  # mapas de región de atracción (Gráficas)
+UPRIGHT_TOLERANCE = 0.2  # |theta| final (rad) para considerar la ejecución un éxito
+INITIAL_TILT = 0.1  # |theta| inicial máxima (rad), sorteada con la semilla de cada ejecución
+
+# Controladores del combo que el simulador sabe ejecutar; el resto corre sin control
+SIM_CONTROLLERS = ROA_CONTROLLERS
 
 
 class SidebarButton(QPushButton):
@@ -112,13 +134,14 @@ class MainWindow(QMainWindow):
         self.stack = QStackedWidget()
         self.stack.setObjectName("content_stack")
 
+        self.experiments = ExperimentDB(EXPERIMENTS_DB)
+        self._run = None
+
         # Pages
         self.page_home = self._make_page("Home", "Bienvenido — Péndulo Invertido")
         self.page_pendulum = PendulumPage()
         self.page_train = self._make_page("Train", "Entrenamiento / Simulación")
-        self.page_graphs = self._make_page(
-            "Gráficas", "Gráficas de respuesta / pérdida"
-        )
+        self.page_graphs = GraphsPage(self.experiments, roa_cache_dir=ROA_CACHE_DIR)
 
         for p in (
             self.page_home,
@@ -139,10 +162,29 @@ class MainWindow(QMainWindow):
         self.sim_timer = QTimer()
         self.sim_timer.timeout.connect(self.update_simulation)
         self.simulator = RandomPendulumData()
+        self.page_graphs.roa_params = {
+            k: getattr(self.simulator, k)
+            for k in ("M", "m", "l", "g", "b", "track_half_range")
+        }
+
+        # Telemetría local: difunde el estado en vivo a visores TCP/WebSocket
+        self.telemetry = TelemetryServer()
+        try:
+            self.telemetry.start()
+        except OSError as exc:
+            print(f"Telemetría deshabilitada: {exc}")
 
         # Connect pendulum page signals
         self.page_pendulum.btn_run.clicked.connect(self.start_simulation)
         self.page_pendulum.btn_stop.clicked.connect(self.stop_simulation)
+        self.page_pendulum.btn_reset.clicked.connect(self.reset_simulation)
+        # Otro controlador u otro nº de eslabones es otro experimento
+        self.page_pendulum.combo_control.currentTextChanged.connect(
+            self.reset_simulation
+        )
+        self.page_pendulum.combo_links.currentTextChanged.connect(
+            self.reset_simulation
+        )
 
     def _make_page(self, title: str, subtitle: str) -> QWidget:
         w = QWidget()
@@ -269,19 +311,128 @@ class MainWindow(QMainWindow):
         self.setStyleSheet(s)
 
     def start_simulation(self):
-        """Inicia la simulación del péndulo"""
+        """Inicia (o reanuda tras una pausa) la simulación del péndulo"""
         print("Iniciando simulación del péndulo")
+        if self._run is None:
+            self._begin_run()
         self.sim_timer.start(30)  # ~33 FPS
 
     def stop_simulation(self):
-        """Detiene la simulación del péndulo"""
+        """Pausa la simulación del péndulo; la ejecución sigue abierta"""
         print("Deteniendo simulación del péndulo")
         self.sim_timer.stop()
 
+    def reset_simulation(self, *_):
+        """Registra la ejecución en curso y prepara una nueva (simulador nuevo).
+
+        Si la simulación estaba en marcha, sigue con la ejecución nueva.
+        """
+        running = self.sim_timer.isActive()
+        self.sim_timer.stop()
+        self._finish_run()
+        self._begin_run()
+        if running:
+            self.sim_timer.start(30)
+
+    def _begin_run(self):
+        """Empieza una ejecución nueva y la graba (telemetría y métricas).
+
+        Cada ejecución parte de una inclinación inicial sorteada con una semilla
+        nueva y usa el controlador del combo si el simulador lo implementa
+        ("none" en otro caso); ambos se guardan con la ejecución. Con más de un
+        eslabón se simula `MultiLinkPendulumData` (los controladores del combo
+        son de un eslabón, así que corre sin control).
+        """
+        name = self.page_pendulum.combo_control.currentText()
+        n_links = int(self.page_pendulum.combo_links.currentText())
+        params = self.page_graphs.roa_params
+        seed = random.randrange(2**31)
+        tilt = random.Random(seed).uniform(-INITIAL_TILT, INITIAL_TILT)
+        if n_links == 1:
+            controller = name if name in SIM_CONTROLLERS else "none"
+            self.simulator = RandomPendulumData(
+                control_func=SIM_CONTROLLERS[name](params) if name in SIM_CONTROLLERS else None,
+                **params,
+            )
+            self.simulator.theta = tilt
+            self.page_pendulum.set_link_ratios(None)
+        else:
+            controller = "none"
+            self.simulator = MultiLinkPendulumData(n_links=n_links, **params)
+            self.simulator.state[:, 2] = tilt
+            self.page_pendulum.set_link_ratios(self.simulator.link_ratios)
+        self.page_pendulum.update_pendulum_state(
+            0.0, 0.0, (tilt,) + (0.0,) * (n_links - 1), (0.0,) * n_links
+        )
+
+        os.makedirs(RUNS_DIR, exist_ok=True)
+        now = time.time()
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now))
+        path = os.path.join(RUNS_DIR, f"run_{stamp}_{int(now * 1000) % 1000:03d}.npz")
+        self._run = {
+            "t0": self.simulator.t,
+            "path": path,
+            "writer": NpzTrajectoryWriter(path, chunk_size=4096),
+            "max_abs_theta": 0.0,
+            "max_abs_x": 0.0,
+            "theta": tilt,
+            "controller": controller,
+            "seed": seed,
+            "n_links": n_links,
+        }
+
+    def _finish_run(self):
+        """Cierra la telemetría y registra la ejecución en la base de datos."""
+        run = self._run
+        if run is None:
+            return
+        self._run = None
+        run["writer"].close()
+
+        sim = self.simulator
+        self.experiments.add_run(
+            run["controller"],
+            # Parámetros por eslabón (m, l) iguales en todos: se guardan como escalares
+            params=dict(self.page_graphs.roa_params),
+            metrics=dict(
+                n_links=run["n_links"],
+                max_abs_theta=run["max_abs_theta"],
+                max_abs_x=run["max_abs_x"],
+                final_abs_theta=abs(run["theta"]),
+                samples=run["writer"].samples_written,
+            ),
+            seed=run["seed"],
+            port=self.page_pendulum.combo_com.currentText(),
+            success=abs(run["theta"]) < UPRIGHT_TOLERANCE,
+            duration=sim.t - run["t0"],
+            telemetry_path=run["path"],
+        )
+        self.page_graphs.refresh()
+
     def update_simulation(self):
         """Actualiza el estado del péndulo con nuevos datos de simulación"""
-        cart_pos, cart_vel, theta, theta_dot = self.simulator.next(0.05)
-        self.page_pendulum.update_pendulum_state(cart_pos, cart_vel, theta, theta_dot)
+        cart_pos, cart_vel, thetas, theta_dots = self.simulator.next(0.05)
+        self.page_pendulum.update_pendulum_state(cart_pos, cart_vel, thetas, theta_dots)
+        # Telemetría y registro llevan el primer eslabón (columnas de un péndulo)
+        if isinstance(thetas, tuple):
+            theta, theta_dot = thetas[0], theta_dots[0]
+        else:
+            theta, theta_dot = thetas, theta_dots
+        self.telemetry.publish(self.simulator.t, cart_pos, cart_vel, theta, theta_dot)
+
+        run = self._run
+        if run is not None:
+            run["writer"].write((self.simulator.t, cart_pos, cart_vel, theta, theta_dot))
+            run["max_abs_theta"] = max(run["max_abs_theta"], abs(theta))
+            run["max_abs_x"] = max(run["max_abs_x"], abs(cart_pos))
+            run["theta"] = theta
+
+    def closeEvent(self, event):
+        self.sim_timer.stop()
+        self._finish_run()
+        self.experiments.close()
+        self.telemetry.stop()
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+"""Backends de `kernels`: latencia de un paso y rendimiento por lotes.
+
+Uso (desde la carpeta UI):
+    python benchmarks/bench_backends.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from layouts.utils.kernels import BACKENDS, linear_gain  # noqa: E402
+from layouts.utils.fast_pendulum_data import FastPendulumData  # noqa: E402
+from layouts.utils.controllers import LinearStateFeedback  # noqa: E402
+from layouts.utils import kernels  # noqa: E402
+
+PARAMS = (1.0, 0.1, 0.5, 9.81, 0.0)
+
+
+def best_of(run, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(steps: int = 20_000, batch: int = 10_000, batch_steps: int = 200):
+    ctrl = LinearStateFeedback.lqr()
+    K, use_K = linear_gain(ctrl)
+    rng = np.random.default_rng(0)
+    initial = rng.normal(size=(batch, 4)) * [0.2, 0.1, 0.2, 0.2]
+
+    results = {}
+    for name, backend in BACKENDS.items():
+        # Warm-up (compilation or cache load)
+        backend.integrate(np.zeros(4), 0.0, 1, 0.02, *PARAMS, K, use_K)
+        backend.integrate_batch(initial[:2].copy(), 1, 0.02, *PARAMS, K, use_K)
+
+        kernels.set_backend(name)
+        sim = FastPendulumData(control_func=ctrl)
+        step = sim.next
+
+        def loop():
+            for _ in range(steps):
+                step(0.02)
+
+        t_next = best_of(loop)
+
+        def run_batch():
+            states = initial.copy()
+            backend.integrate_batch(states, batch_steps, 0.02, *PARAMS, K, use_K)
+            results[name] = states
+
+        t_batch = best_of(run_batch)
+        print(f"[{name}]")
+        print(f"  FastPendulumData.next (LQR): {t_next / steps * 1e6:8.2f} us/paso")
+        print(
+            f"  lote {batch} x {batch_steps} pasos   : "
+            f"{batch * batch_steps / t_batch / 1e6:8.2f} M pasos/s"
+        )
+
+    names = list(results)
+    for other in names[1:]:
+        same = np.array_equal(results[names[0]], results[other], equal_nan=True)
+        print(f"{names[0]} == {other}: {'idénticos' if same else 'DISTINTOS'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Modo lineal vs integración no lineal (RK4) con un LQR.
+
+Uso (desde la carpeta UI):
+    python benchmarks/bench_linear.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from layouts.utils.random_pendulum_data import RandomPendulumData  # noqa: E402
+from layouts.utils.multilink_pendulum_data import MultiLinkPendulumData  # noqa: E402
+from layouts.utils.linear_pendulum_data import (  # noqa: E402
+    LinearPendulumData,
+    linear_error_report,
+    linear_rollout,
+)
+from layouts.utils.controllers import LinearStateFeedback  # noqa: E402
+
+
+def best_of(run, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n: int = 1000, steps: int = 500, dt: float = 0.02):
+    ctrl = LinearStateFeedback.lqr(dt=dt)
+    rng = np.random.default_rng(0)
+    x0 = rng.normal(size=(n, 4)) * [0.2, 0.1, 0.1, 0.2]
+
+    def nonlinear():
+        sim = MultiLinkPendulumData(n_links=1, batch=n, control_func=ctrl)
+        sim.state = x0.copy()
+        for _ in range(steps):
+            sim.step(dt)
+
+    t_nl = best_of(nonlinear)
+    t_rec = best_of(lambda: linear_rollout(x0, steps, dt, ctrl))
+    t_pow = best_of(lambda: linear_rollout(x0, steps, dt, ctrl, method="powers"))
+    print(f"[{n} condiciones iniciales x {steps} pasos]")
+    print(f"  RK4 no lineal (lote)    : {t_nl * 1e3:9.1f} ms")
+    print(f"  lineal, recursivo       : {t_rec * 1e3:9.1f} ms  (x{t_nl / t_rec:.0f})")
+    print(f"  lineal, potencias       : {t_pow * 1e3:9.1f} ms  (x{t_nl / t_pow:.0f})")
+
+    def scalar(cls):
+        sim = cls(control_func=ctrl)
+        step = sim.next
+        for _ in range(steps * 20):
+            step(dt)
+
+    t_ref = best_of(lambda: scalar(RandomPendulumData))
+    t_lin = best_of(lambda: scalar(LinearPendulumData))
+    print(f"[escalar, {steps * 20} pasos]")
+    print(f"  RandomPendulumData.next : {t_ref * 1e3:9.1f} ms")
+    print(f"  LinearPendulumData.next : {t_lin * 1e3:9.1f} ms  (x{t_ref / t_lin:.1f})")
+
+    report = linear_error_report(x0, steps, dt, ctrl)
+    print("[error contra no lineal]")
+    print(f"  max |error| (x, x_dot, theta, theta_dot): {report['max_abs']}")
+    print(f"  RMS                                     : {report['rms']}")
+    print(f"  trayectorias con cambio a no lineal     : {report['fallback_fraction']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Coste por paso de `MultiLinkPendulumData` según nº de eslabones y lote.
+
+Uso (desde la carpeta UI):
+    python benchmarks/bench_multilink.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from layouts.utils.multilink_pendulum_data import MultiLinkPendulumData  # noqa: E402
+from layouts.utils.fast_pendulum_data import FastPendulumData  # noqa: E402
+
+
+def time_steps(sim, steps, dt=0.01):
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(steps):
+            sim.step(dt)
+        best = min(best, time.perf_counter() - start)
+    return best / steps
+
+
+def main(steps: int = 200):
+    ref = FastPendulumData()
+    start = time.perf_counter()
+    ref.advance(steps * 10, 0.01)
+    scalar = (time.perf_counter() - start) / (steps * 10)
+    print(f"Referencia escalar (FastPendulumData, 1 eslabón): {scalar * 1e6:8.2f} us/paso")
+    print()
+    print(f"{'eslabones':>9} {'lote':>7} {'us/paso':>10} {'ns/instancia·paso':>18}")
+    for n_links in (1, 2, 3, 5):
+        for batch in (1, 64, 1024, 8192):
+            sim = MultiLinkPendulumData(n_links=n_links, batch=batch)
+            per_step = time_steps(sim, steps if batch < 8192 else steps // 4)
+            print(
+                f"{n_links:>9} {batch:>7} {per_step * 1e6:>10.1f} "
+                f"{per_step / batch * 1e9:>18.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
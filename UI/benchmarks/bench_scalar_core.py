@@ -0,0 +1,55 @@
+"""Pasos por segundo: `RandomPendulumData` vs `FastPendulumData`.
+
+Uso (desde la carpeta UI):
+    python benchmarks/bench_scalar_core.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from layouts.utils.random_pendulum_data import RandomPendulumData  # noqa: E402
+from layouts.utils.fast_pendulum_data import FastPendulumData  # noqa: E402
+
+
+def lqr_like(state, t):
+    x, x_dot, theta, theta_dot = state
+    return 1.0 * x + 2.0 * x_dot + 30.0 * theta + 5.0 * theta_dot
+
+
+def steps_per_second(run, steps):
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        run(steps)
+        best = min(best, time.perf_counter() - start)
+    return steps / best
+
+
+def main(steps: int = 50_000, dt: float = 0.02):
+    for label, ctrl in (("sin control", None), ("con control", lqr_like)):
+        ref = steps_per_second(
+            lambda n: _loop(RandomPendulumData(control_func=ctrl), n, dt), steps
+        )
+        fast = steps_per_second(
+            lambda n: _loop(FastPendulumData(control_func=ctrl), n, dt), steps
+        )
+        adv = steps_per_second(
+            lambda n: FastPendulumData(control_func=ctrl).advance(n, dt), steps
+        )
+        print(f"[{label}]")
+        print(f"  RandomPendulumData.next : {ref:12,.0f} pasos/s")
+        print(f"  FastPendulumData.next   : {fast:12,.0f} pasos/s  (x{fast / ref:.2f})")
+        print(f"  FastPendulumData.advance: {adv:12,.0f} pasos/s  (x{adv / ref:.2f})")
+
+
+def _loop(sim, n, dt):
+    step = sim.next
+    for _ in range(n):
+        step(dt)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Coste de `SensorActuatorPipeline` frente al controlador ideal.
+
+Uso (desde la carpeta UI):
+    python benchmarks/bench_sensor_pipeline.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from layouts.utils.random_pendulum_data import RandomPendulumData  # noqa: E402
+from layouts.utils.multilink_pendulum_data import MultiLinkPendulumData  # noqa: E402
+from layouts.utils.controllers import LinearStateFeedback  # noqa: E402
+from layouts.utils.sensor_pipeline import (  # noqa: E402
+    ColoredNoise,
+    Delay,
+    GaussianNoise,
+    Quantize,
+    RateLimit,
+    Saturation,
+    SensorActuatorPipeline,
+)
+
+PERIOD = 0.01
+
+
+def full_pipeline(ctrl):
+    return SensorActuatorPipeline(
+        ctrl,
+        period=PERIOD,
+        sensors=[
+            Quantize.encoder(),
+            GaussianNoise([0.0, 0.01, 0.0, 0.02], seed=1),
+            ColoredNoise([0.001, 0.0, 0.002, 0.0], tau=0.1, seed=2),
+        ],
+        actuators=[Saturation(10.0), RateLimit(200.0), Delay(2)],
+    )
+
+
+def best_of(run, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(steps: int = 1000, batch: int = 4096):
+    ctrl = LinearStateFeedback.lqr(dt=PERIOD)
+
+    def scalar(wrap):
+        sim = RandomPendulumData(control_func=wrap(ctrl), control_period=PERIOD)
+        for _ in range(steps):
+            sim.next(PERIOD)
+
+    def batched(wrap):
+        sim = MultiLinkPendulumData(n_links=1, batch=batch, control_func=wrap(ctrl))
+        for _ in range(steps):
+            sim.step(PERIOD)
+
+    for label, run, unit in (
+        ("escalar (ZOH 100 Hz)", scalar, steps),
+        (f"lote {batch}", batched, steps),
+    ):
+        ideal = best_of(lambda: run(lambda c: c))
+        real = best_of(lambda: run(full_pipeline))
+        print(f"[{label}]")
+        print(f"  controlador ideal : {ideal / unit * 1e6:9.1f} us/paso")
+        print(
+            f"  con sensores/act. : {real / unit * 1e6:9.1f} us/paso"
+            f"  (+{(real - ideal) / unit * 1e6:.1f} us)"
+        )
+
+
+if __name__ == "__main__":
+    main()
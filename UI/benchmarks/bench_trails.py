@@ -0,0 +1,59 @@
+"""Coste de la estela y del diagrama de fase en `PendulumWidget.paintEvent`.
+
+Pinta el widget fuera de pantalla con 10 s de historial a 60 FPS (600
+muestras) y compara el tiempo por cuadro con y sin superposiciones.
+
+Uso (desde la carpeta UI):
+    python benchmarks/bench_trails.py
+"""
+
+import os
+import sys
+import time
+from math import sin
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QImage  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from layouts.IP import PendulumWidget  # noqa: E402
+
+
+def frame_time(widget, image, frames):
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for i in range(frames):
+            t = i / 60.0
+            widget.set_state(0.5 * sin(0.3 * t), 0.0, 0.8 * sin(2.0 * t), 1.6 * sin(t))
+            widget.render(image)
+        best = min(best, time.perf_counter() - start)
+    return best / frames
+
+
+def main(frames: int = 1200):
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841
+    widget = PendulumWidget()
+    widget.resize(900, 500)
+    image = QImage(widget.size(), QImage.Format.Format_ARGB32_Premultiplied)
+
+    base = frame_time(widget, image, frames)
+    widget.set_trails_enabled(True)
+    trails = frame_time(widget, image, frames)
+    widget.set_phase_portrait_enabled(True)
+    both = frame_time(widget, image, frames)
+
+    budget = 1000.0 / 60.0
+    print(f"sin superposiciones: {base * 1e3:.3f} ms/cuadro")
+    for label, value in (("con estela", trails), ("estela + fase", both)):
+        extra = (value - base) * 1e3
+        print(
+            f"{label:<19}: {value * 1e3:.3f} ms/cuadro "
+            f"(+{extra:.3f} ms, {extra / budget:.1%} de un cuadro a 60 FPS)"
+        )
+
+
+if __name__ == "__main__":
+    main()
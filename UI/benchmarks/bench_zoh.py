@@ -0,0 +1,62 @@
+"""Controlador en cada etapa de RK4 vs controlador digital con ZOH.
+
+Planta integrada a 2 ms en ambos casos; el controlador digital corre a 100 Hz.
+
+Uso (desde la carpeta UI):
+    python benchmarks/bench_zoh.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from layouts.utils.random_pendulum_data import RandomPendulumData  # noqa: E402
+from layouts.utils.controllers import LinearStateFeedback  # noqa: E402
+
+
+def run(sim, seconds, dt):
+    calls = [0]
+    ctrl = sim.control_func
+
+    def counted(state, t):
+        calls[0] += 1
+        return ctrl(state, t)
+
+    sim.control_func = counted
+    sim.max_substep = 0.002
+    sim.theta = 0.2
+    start = time.perf_counter()
+    for _ in range(int(round(seconds / dt))):
+        state = sim.next(dt)
+    elapsed = time.perf_counter() - start
+    return calls[0] / seconds, elapsed, state
+
+
+def main(seconds: float = 20.0, dt: float = 0.02):
+    ctrl = LinearStateFeedback.lqr(dt=0.01)
+    rows = (
+        ("control en cada etapa RK4", RandomPendulumData(control_func=ctrl)),
+        (
+            "ZOH 100 Hz",
+            RandomPendulumData(control_func=ctrl, control_period=0.01),
+        ),
+        (
+            "ZOH 100 Hz + 10 ms retardo",
+            RandomPendulumData(
+                control_func=ctrl, control_period=0.01, control_delay=0.01
+            ),
+        ),
+    )
+    print(f"{seconds:.0f} s simulados, planta a 2 ms")
+    for label, sim in rows:
+        rate, elapsed, state = run(sim, seconds, dt)
+        print(
+            f"  {label:28s}: {rate:7.0f} llamadas/s  {elapsed * 1e3:7.1f} ms"
+            f"  theta final {state[2]:+.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
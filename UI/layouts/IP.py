@@ -1,8 +1,16 @@
 from PySide6.QtWidgets import QWidget
-from PySide6.QtGui import QPainter, QPen, QBrush
-from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QPolygonF
+from PySide6.QtCore import Qt, QPointF, QRectF
 
-from math import sin, cos
+from math import sin, cos, pi
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from pyqtgraph.functions import create_qpolygonf, ndarray_from_qpolygonf
+except ImportError:  # sin pyqtgraph se construyen los QPolygonF en cada cuadro
+    create_qpolygonf = None
 
 # Dracula palette
 DRACULA = {
@@ -18,6 +26,243 @@ DRACULA = {
 }
 
 
+def link_angles(theta) -> Tuple[float, ...]:
+    """Normaliza `theta` (ángulo o secuencia de ángulos) a una tupla de floats."""
+    if np.ndim(theta) == 0:
+        return (float(theta),)
+    return tuple(float(th) for th in theta)
+
+
+def pendulum_geometry(w: float, h: float, rod_length_ratio: float = 0.35):
+    """Geometría común del dibujo para un área de w x h píxeles.
+
+    Retorna (track_left, track_right, track_width, cart_y, rod_length).
+    """
+    # Compute mapping for cart x: map [-1,1] to available track width
+    margin = 24
+    track_left = margin
+    track_right = w - margin
+    track_width = max(1, track_right - track_left)
+    cart_y = h * 0.55  # baseline vertical position (will scale with widget)
+    rod_length = h * rod_length_ratio
+    return track_left, track_right, track_width, cart_y, rod_length
+
+
+class TrailBuffer:
+    """Historial circular de muestras para estelas y diagramas de fase.
+
+    Las muestras viven en un array NumPy preasignado de `capacity` filas. Al
+    dibujar, los puntos en píxeles se copian a `groups` QPolygonF preasignados
+    (vistas NumPy vía pyqtgraph), uno por tramo; cada tramo se pinta con un solo
+    `drawPolyline` y más opacidad cuanto más reciente. Nada se reconstruye
+    desde cero en cada cuadro.
+    """
+
+    def __init__(self, capacity: int, columns: int = 2, groups: int = 8):
+        self.capacity = max(2, int(capacity))
+        self.groups = max(1, int(groups))
+        self.data = np.zeros((self.capacity, columns))
+        self.head = 0  # índice de la próxima escritura
+        self.size = 0
+
+        self._ordered = np.zeros((self.capacity, columns))
+        self._pixels = np.zeros((self.capacity, 2))
+        group_len = -(-self.capacity // self.groups) + 1
+        self._polys = None
+        if create_qpolygonf is not None:
+            self._polys = [create_qpolygonf(group_len) for _ in range(self.groups)]
+            self._views = [ndarray_from_qpolygonf(p) for p in self._polys]
+        self._pens = {}
+
+    def push(self, *values: float):
+        self.data[self.head] = values
+        self.head = (self.head + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def clear(self):
+        self.head = 0
+        self.size = 0
+
+    def ordered(self) -> np.ndarray:
+        """Muestras de la más antigua a la más reciente (sobre un buffer fijo)."""
+        n = self.size
+        if n < self.capacity:
+            return self.data[:n]
+        tail = self.capacity - self.head
+        self._ordered[:tail] = self.data[self.head :]
+        self._ordered[tail:] = self.data[: self.head]
+        return self._ordered
+
+    def pixels(self) -> np.ndarray:
+        """Buffer (size, 2) donde el llamador escribe los puntos en píxeles."""
+        return self._pixels[: self.size]
+
+    def _group_pens(self, color: str, width: float):
+        key = (color, width)
+        pens = self._pens.get(key)
+        if pens is None:
+            pens = []
+            for g in range(self.groups):
+                c = QColor(color)
+                c.setAlphaF((g + 1) / self.groups)
+                pen = QPen(c)
+                pen.setWidthF(width)
+                pens.append(pen)
+            self._pens[key] = pens
+        return pens
+
+    def draw(
+        self,
+        painter: QPainter,
+        color: str,
+        width: float = 1.0,
+        breaks: Optional[np.ndarray] = None,
+    ):
+        """Pinta `pixels()` como polilínea que se desvanece hacia lo más antiguo.
+
+        `breaks` (bool, size - 1) marca los segmentos i -> i + 1 que no se unen
+        (p. ej. theta saltando de +pi a -pi); el tramo se parte ahí.
+
+        Con width <= 1 Qt usa su trazado rápido de líneas finas; líneas más
+        gruesas y antialias multiplican el coste del cuadro.
+        """
+        n = self.size
+        if n < 2:
+            return
+        step = -(-(n - 1) // self.groups)
+        drawn = -(-(n - 1) // step)  # tramos con datos; el último va opaco
+        pens = self._group_pens(color, width)[self.groups - drawn :]
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        for g in range(self.groups):
+            start = g * step
+            if start >= n - 1:
+                break
+            end = min(start + step, n - 1)
+            painter.setPen(pens[g])
+            if breaks is None or not breaks[start:end].any():
+                self._polyline(painter, g, start, end)
+                continue
+            cuts = start + np.flatnonzero(breaks[start:end])
+            for a, b in zip(np.append(start, cuts + 1), np.append(cuts, end)):
+                if b > a:
+                    self._polyline(painter, g, a, b)
+
+    def _polyline(self, painter: QPainter, g: int, start: int, end: int):
+        """Pinta los puntos [start, end] con el QPolygonF del tramo `g`."""
+        pix = self._pixels
+        if self._polys is not None:
+            k = end - start + 1
+            view = self._views[g]
+            view[:k] = pix[start : end + 1]
+            view[k:] = pix[end]  # relleno degenerado con el último punto
+            poly = self._polys[g]
+        else:
+            poly = QPolygonF([QPointF(x, y) for x, y in pix[start : end + 1]])
+        painter.drawPolyline(poly)
+
+
+def draw_pendulum(
+    painter: QPainter,
+    w: float,
+    h: float,
+    cart_pos: float,
+    theta,
+    cart_width: float = 120,
+    cart_height: float = 36,
+    rod_length_ratio: float = 0.35,
+    pivot_offset_y: float = 6,
+    link_ratios: Optional[Sequence[float]] = None,
+):
+    """Dibuja carrito, varilla y masa con `painter` en un área de w x h píxeles.
+
+    `theta` puede ser un ángulo o una secuencia de ángulos absolutos (péndulo de
+    N eslabones); `link_ratios` reparte la longitud total entre los eslabones
+    (por defecto, a partes iguales).
+
+    Es la lógica de `PendulumWidget.paintEvent`, separada para poder pintar
+    también sobre destinos fuera de pantalla (`QImage`) al exportar vídeo.
+    """
+    track_left, track_right, track_width, cart_y, rod_length = pendulum_geometry(
+        w, h, rod_length_ratio
+    )
+
+    # position in pixels
+    x_pix = track_left + (cart_pos + 1.0) / 2.0 * track_width
+
+    # Cart rectangle
+    cart_w = min(cart_width, track_width * 0.35)
+    cart_h = cart_height
+    cart_x = x_pix - cart_w / 2
+
+    # Draw track line, te 16 is a hight fro the reels
+    pen = QPen(DRACULA["muted"])
+    pen.setWidth(2)
+    painter.setPen(pen)
+    painter.drawLine(
+        int(track_left),
+        int(cart_y + cart_h + 16),
+        int(track_right),
+        int(cart_y + cart_h + 16),
+    )
+
+    # Draw cart body
+    cart_rect_brush = QBrush(DRACULA["panel"])  # darker body
+    cart_border = QPen(DRACULA["current_line"])  # border
+    cart_border.setWidth(2)
+    painter.setPen(cart_border)
+    painter.setBrush(cart_rect_brush)
+    painter.drawRoundedRect(int(cart_x), int(cart_y), int(cart_w), int(cart_h), 6, 6)
+
+    # Wheels
+    wheel_radius = 8
+    wheel_pen = QPen(DRACULA["current_line"])
+    wheel_pen.setWidth(2)
+    painter.setPen(wheel_pen)
+    painter.setBrush(QBrush(DRACULA["muted"]))
+    left_wheel_c = QPointF(cart_x + cart_w * 0.22, cart_y + cart_h + wheel_radius)
+    right_wheel_c = QPointF(cart_x + cart_w * 0.78, cart_y + cart_h + wheel_radius)
+    painter.drawEllipse(left_wheel_c, wheel_radius, wheel_radius)
+    painter.drawEllipse(right_wheel_c, wheel_radius, wheel_radius)
+
+    # Pivot point (top center of cart)
+    pivot_x = x_pix
+    pivot_y = cart_y - pivot_offset_y
+
+    # Link end points (theta: 0 = up)
+    # Convert theta so that 0 rad => up (negative y direction)
+    thetas = link_angles(theta)
+    if link_ratios is None:
+        link_ratios = (1.0 / len(thetas),) * len(thetas)
+    joints = [(pivot_x, pivot_y)]
+    for th, ratio in zip(thetas, link_ratios):
+        jx, jy = joints[-1]
+        link_length = rod_length * ratio
+        joints.append((jx + link_length * sin(th), jy - link_length * cos(th)))
+    bob_x, bob_y = joints[-1]
+
+    # Draw rods
+    rod_pen = QPen(DRACULA["fg"])  # bright rod
+    rod_pen.setWidth(3)
+    painter.setPen(rod_pen)
+    for (x0, y0), (x1, y1) in zip(joints[:-1], joints[1:]):
+        painter.drawLine(int(x0), int(y0), int(x1), int(y1))
+
+    # Draw pivot
+    pivot_brush = QBrush(DRACULA["accent"])
+    painter.setBrush(pivot_brush)
+    painter.setPen(QPen(DRACULA["accent"]))
+    painter.drawEllipse(QPointF(pivot_x, pivot_y), 4, 4)
+    for jx, jy in joints[1:-1]:
+        painter.drawEllipse(QPointF(jx, jy), 5, 5)
+
+    # Draw bob (mass)
+    bob_radius = max(10, int(min(28, h * 0.05)))
+    painter.setPen(QPen(DRACULA["current_line"]))
+    painter.setBrush(QBrush(DRACULA["orange"]))
+    painter.drawEllipse(QPointF(bob_x, bob_y), bob_radius, bob_radius)
+
+
 class PendulumWidget(QWidget):
     """Widget que dibuja un carrito (cart), una varilla (rod) y una masa (bob).
 
@@ -29,132 +274,176 @@ class PendulumWidget(QWidget):
     Parámetros visuales:
         - cart_width, cart_height: tamaño del carrito en píxeles
         - rod_length_ratio: fracción de la altura del widget que ocupa la varilla
+
+    Historial de la estela y del diagrama de fase (fijo al construir):
+        - history_seconds: segundos que se conservan
+        - history_fps: muestras por segundo que cabe esperar en set_state
     """
 
-    def __init__(self, parent=None):
+    def __init__(
+        self, parent=None, history_seconds: float = 10.0, history_fps: float = 60
+    ):
         super().__init__(parent)
         # Estado (valores por defecto)
         self.cart_pos = 0.0  # normalizado -1..1
         self.cart_vel = 0.0
         self.theta = 0.0  # radians, 0 = vertical up
         self.theta_dot = 0.0
+        self.thetas = (0.0,)  # ángulos de cada eslabón (N eslabones)
 
         # Visual tuning
         self.cart_width = 120
         self.cart_height = 36
         self.rod_length_ratio = 0.35  # fraction of widget height
         self.pivot_offset_y = 6  # pixels above cart top where pivot is
+        self.link_ratios = None  # reparto de la varilla entre eslabones (None = igual)
 
         # Mapping: si tus datos provienen en metros, ajusta pos_scale
         self.pos_scale = 1.0
 
+        # Estela del bob y diagrama de fase theta vs theta_dot (opcionales)
+        self.trails_enabled = False
+        self.phase_enabled = False
+        capacity = int(history_seconds * history_fps)
+        self._trail = TrailBuffer(capacity, columns=3)  # cart_pos, sin, cos
+        self._phase = TrailBuffer(capacity, columns=2)  # theta, theta_dot
+
         # Make sure widget repaints smoothly
         self.setMinimumHeight(220)
 
-    def set_state(
-        self, cart_pos: float, cart_vel: float, theta: float, theta_dot: float
-    ):
+    def set_state(self, cart_pos: float, cart_vel: float, theta, theta_dot):
         """Actualiza el estado y repinta.
 
         - cart_pos: normalizado en [-1,1] (izquierda a derecha)
         - cart_vel: velocidad del carrito (no usada para dibujo actualmente)
         - theta: ángulo en radianes, 0 apunta hacia arriba, positivo hacia la derecha
-        - theta_dot: velocidad angular
+          (o una secuencia de ángulos, uno por eslabón; ver `MultiLinkPendulumData`)
+        - theta_dot: velocidad angular (o secuencia, una por eslabón)
+
+        La estela sigue al extremo del último eslabón y el diagrama de fase
+        usa el primero.
         """
         self.cart_pos = max(-1.0, min(1.0, float(cart_pos)))
         self.cart_vel = float(cart_vel)
-        self.theta = float(theta)
-        self.theta_dot = float(theta_dot)
+        self.thetas = link_angles(theta)
+        self.theta = self.thetas[0]
+        self.theta_dot = link_angles(theta_dot)[0]
+        if self.trails_enabled:
+            if len(self.thetas) == 1:
+                self._trail.push(self.cart_pos, sin(self.theta), cos(self.theta))
+            else:
+                ratios = self.link_ratios or (1.0 / len(self.thetas),) * len(self.thetas)
+                tip_sin = sum(r * sin(th) for r, th in zip(ratios, self.thetas))
+                tip_cos = sum(r * cos(th) for r, th in zip(ratios, self.thetas))
+                self._trail.push(self.cart_pos, tip_sin, tip_cos)
+        if self.phase_enabled:
+            self._phase.push(self.theta, self.theta_dot)
+        self.update()
+
+    def set_trails_enabled(self, enabled: bool):
+        """Activa/desactiva la estela del bob (empieza vacía)."""
+        self.trails_enabled = bool(enabled)
+        self._trail.clear()
+        self.update()
+
+    def set_phase_portrait_enabled(self, enabled: bool):
+        """Activa/desactiva el recuadro con el diagrama de fase (empieza vacío)."""
+        self.phase_enabled = bool(enabled)
+        self._phase.clear()
+        self.update()
+
+    def clear_history(self):
+        """Borra estela y diagrama de fase (p. ej. al reiniciar la simulación)."""
+        self._trail.clear()
+        self._phase.clear()
         self.update()
 
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        w = self.width()
-        h = self.height()
-
         # Background (transparent assumed; parent frame draws border)
         painter.fillRect(self.rect(), QBrush(Qt.GlobalColor.transparent))
 
-        # Compute mapping for cart x: map [-1,1] to available track width
-        margin = 24
-        track_left = margin
-        track_right = w - margin
-        track_width = max(1, track_right - track_left)
-
-        # position in pixels
-        x_pix = track_left + (self.cart_pos + 1.0) / 2.0 * track_width
-
-        # Cart rectangle
-        cart_w = min(self.cart_width, track_width * 0.35)
-        cart_h = self.cart_height
-        cart_x = x_pix - cart_w / 2
-        cart_y = h * 0.55  # baseline vertical position (will scale with widget)
-
-        # Draw track line, te 16 is a hight fro the reels
-        pen = QPen(DRACULA["muted"])
-        pen.setWidth(2)
-        painter.setPen(pen)
-        painter.drawLine(
-            int(track_left),
-            int(cart_y + cart_h + 16),
-            int(track_right),
-            int(cart_y + cart_h + 16),
-        )
-
-        # Draw cart body
-        cart_rect_brush = QBrush(DRACULA["panel"])  # darker body
-        cart_border = QPen(DRACULA["current_line"])  # border
-        cart_border.setWidth(2)
-        painter.setPen(cart_border)
-        painter.setBrush(cart_rect_brush)
-        painter.drawRoundedRect(
-            int(cart_x), int(cart_y), int(cart_w), int(cart_h), 6, 6
+        if self.trails_enabled:
+            self._draw_trail(painter, self.width(), self.height())
+
+        draw_pendulum(
+            painter,
+            self.width(),
+            self.height(),
+            self.cart_pos,
+            self.thetas,
+            cart_width=self.cart_width,
+            cart_height=self.cart_height,
+            rod_length_ratio=self.rod_length_ratio,
+            pivot_offset_y=self.pivot_offset_y,
+            link_ratios=self.link_ratios,
         )
 
-        # Wheels
-        wheel_radius = 8
-        wheel_pen = QPen(DRACULA["current_line"])
-        wheel_pen.setWidth(2)
-        painter.setPen(wheel_pen)
-        painter.setBrush(QBrush(DRACULA["muted"]))
-        left_wheel_c = QPointF(cart_x + cart_w * 0.22, cart_y + cart_h + wheel_radius)
-        right_wheel_c = QPointF(cart_x + cart_w * 0.78, cart_y + cart_h + wheel_radius)
-        painter.drawEllipse(left_wheel_c, wheel_radius, wheel_radius)
-        painter.drawEllipse(right_wheel_c, wheel_radius, wheel_radius)
-
-        # Pivot point (top center of cart)
-        pivot_x = x_pix
-        pivot_y = cart_y - self.pivot_offset_y
-
-        # Rod length
-        rod_length = h * self.rod_length_ratio
+        if self.phase_enabled:
+            self._draw_phase_portrait(painter, self.width(), self.height())
 
-        # Bob position (theta: 0 = up)
-        # Convert theta so that 0 rad => up (negative y direction)
-        bob_x = pivot_x + rod_length * sin(self.theta)
-        bob_y = pivot_y - rod_length * cos(self.theta)
-
-        # Draw rod
-        rod_pen = QPen(DRACULA["fg"])  # bright rod
-        rod_pen.setWidth(3)
-        painter.setPen(rod_pen)
-        painter.drawLine(int(pivot_x), int(pivot_y), int(bob_x), int(bob_y))
+        painter.end()
 
-        # Draw pivot
-        pivot_brush = QBrush(DRACULA["accent"])
-        painter.setBrush(pivot_brush)
-        painter.setPen(QPen(DRACULA["accent"]))
-        painter.drawEllipse(QPointF(pivot_x, pivot_y), 4, 4)
+    def _draw_trail(self, painter: QPainter, w: float, h: float):
+        track_left, _, track_width, cart_y, rod_length = pendulum_geometry(
+            w, h, self.rod_length_ratio
+        )
+        pivot_y = cart_y - self.pivot_offset_y
 
-        # Draw bob (mass)
-        bob_radius = max(10, int(min(28, h * 0.05)))
+        # Misma proyección que draw_pendulum, vectorizada sobre el historial
+        data = self._trail.ordered()
+        pix = self._trail.pixels()
+        np.multiply(data[:, 0], 0.5 * track_width, out=pix[:, 0])
+        pix[:, 0] += track_left + 0.5 * track_width
+        pix[:, 0] += rod_length * data[:, 1]
+        np.multiply(data[:, 2], -rod_length, out=pix[:, 1])
+        pix[:, 1] += pivot_y
+        self._trail.draw(painter, DRACULA["orange"])
+
+    def _draw_phase_portrait(self, painter: QPainter, w: float, h: float):
+        # Recuadro en la esquina superior derecha
+        margin = 12
+        inset_w = min(240.0, w * 0.3)
+        inset_h = inset_w * 0.6
+        rect = QRectF(w - inset_w - margin, margin, inset_w, inset_h)
+        cx = rect.center().x()
+        cy = rect.center().y()
+
+        panel = QColor(DRACULA["panel"])
+        panel.setAlphaF(0.85)
         painter.setPen(QPen(DRACULA["current_line"]))
-        painter.setBrush(QBrush(DRACULA["orange"]))
-        painter.drawEllipse(QPointF(bob_x, bob_y), bob_radius, bob_radius)
+        painter.setBrush(QBrush(panel))
+        painter.drawRoundedRect(rect, 6, 6)
+        painter.setPen(QPen(DRACULA["muted"]))
+        painter.drawLine(QPointF(rect.left(), cy), QPointF(rect.right(), cy))
+        painter.drawLine(QPointF(cx, rect.top()), QPointF(cx, rect.bottom()))
+        painter.drawText(rect.adjusted(6, 2, -6, -2), Qt.AlignmentFlag.AlignRight, "θ")
+        painter.drawText(rect.adjusted(6, 2, -6, -2), Qt.AlignmentFlag.AlignLeft, "θ'")
+
+        if self._phase.size == 0:
+            return
+
+        # theta en [-pi, pi] a lo ancho; theta_dot escalado al máximo del historial
+        data = self._phase.ordered()
+        pix = self._phase.pixels()
+        rate_scale = max(1.0, float(np.abs(data[:, 1]).max()))
+        np.multiply(data[:, 0], 0.5 * inset_w / pi, out=pix[:, 0])
+        pix[:, 0] += cx
+        np.multiply(data[:, 1], -0.5 * inset_h / rate_scale, out=pix[:, 1])
+        pix[:, 1] += cy
+        painter.setClipRect(rect)
+        # theta envuelta: no unir los puntos a ambos lados de un salto +-pi
+        self._phase.draw(
+            painter, DRACULA["green"], breaks=np.abs(np.diff(data[:, 0])) > pi
+        )
 
-        painter.end()
+        x, y = pix[-1]
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QBrush(DRACULA["accent"]))
+        painter.drawEllipse(QPointF(x, y), 3, 3)
+        painter.setClipping(False)
 
 
 # Small test when se ejecuta directamente
@@ -1,2 +1,3 @@
 from .pendulum import *
+from .graphs import *
 from .utils import *
@@ -0,0 +1,283 @@
+import time
+
+from PySide6.QtWidgets import (
+    QWidget,
+    QLabel,
+    QHBoxLayout,
+    QVBoxLayout,
+    QComboBox,
+    QPushButton,
+    QSizePolicy,
+    QFrame,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+)
+from PySide6.QtCore import Qt, QRectF, QThread, Signal
+
+import numpy as np
+import pyqtgraph as pg
+
+from .IP import DRACULA
+from .utils.experiment_db import ExperimentDB
+from .utils.controllers import LinearStateFeedback
+from .utils.region_of_attraction import roa_map
+
+# Controladores con versión por lotes para los mapas de región de atracción.
+# Reciben los parámetros físicos y retornan control_func(state, t).
+ROA_CONTROLLERS = {
+    "LQR": lambda p: LinearStateFeedback.lqr(
+        **{k: v for k, v in p.items() if k in ("M", "m", "l", "g", "b")}
+    ),
+}
+
+
+class _RoaWorker(QThread):
+    """Calcula un `roa_map` fuera del hilo de la UI.
+
+    Emite `done(RoaMap)` o, si el cálculo lanza una excepción, `failed(mensaje)`.
+    """
+
+    done = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, kwargs, parent=None):
+        super().__init__(parent)
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            roa = roa_map(**self.kwargs)
+        except Exception as exc:
+            self.failed.emit(f"{type(exc).__name__}: {exc}")
+            return
+        self.done.emit(roa)
+
+
+class GraphsPage(QWidget):
+    """Página de gráficas: historial de ejecuciones guardadas en `ExperimentDB`.
+
+    Filtra por controlador y resultado y muestra las ejecuciones más recientes.
+    Llama a `refresh()` después de registrar una ejecución nueva.
+
+    A la derecha muestra el mapa de región de atracción (theta, theta_dot) del
+    controlador elegido para `roa_params` (parámetros de `RandomPendulumData`),
+    cacheado en disco en `roa_cache_dir`.
+    """
+
+    ALL = "Todos"
+    COLUMNS = ("id", "Fecha", "Control", "l (m)", "Éxito", "Duración (s)", "max |θ|")
+
+    def __init__(self, db: ExperimentDB, parent=None, roa_cache_dir="roa_cache"):
+        super().__init__(parent)
+        self.setObjectName("page_graphs_custom")
+        self.db = db
+        self.roa_cache_dir = roa_cache_dir
+        self.roa_params = {}
+        self._roa_worker = None
+        self._build_ui()
+        self.refresh()
+
+    def _build_ui(self):
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(16, 16, 16, 16)
+        main_layout.setSpacing(12)
+
+        title = QLabel("Gráficas")
+        title.setObjectName("page_title")
+        subtitle = QLabel("Historial de ejecuciones y métricas")
+        subtitle.setObjectName("page_subtitle")
+        subtitle.setWordWrap(True)
+
+        main_layout.addWidget(title)
+        main_layout.addWidget(subtitle)
+
+        # Marco de filtros
+        filter_frame = QFrame()
+        filter_frame.setFrameStyle(QFrame.Shape.Box)
+        filter_frame.setLineWidth(1)
+        filter_frame.setStyleSheet("QFrame { border-color: #6272a4; }")
+
+        top_row = QHBoxLayout(filter_frame)
+        top_row.setContentsMargins(12, 12, 12, 12)
+        top_row.setSpacing(8)
+
+        top_row.addWidget(QLabel("Control:"))
+        self.combo_control = QComboBox()
+        self.combo_control.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        top_row.addWidget(self.combo_control)
+
+        top_row.addSpacing(16)
+
+        top_row.addWidget(QLabel("Resultado:"))
+        self.combo_result = QComboBox()
+        self.combo_result.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        self.combo_result.addItems([self.ALL, "Éxito", "Fallo"])
+        top_row.addWidget(self.combo_result)
+
+        top_row.addStretch(1)
+
+        self.lbl_count = QLabel("")
+        top_row.addWidget(self.lbl_count)
+
+        self.btn_refresh = QPushButton("🔄")
+        self.btn_refresh.setFixedSize(44, 36)
+        self.btn_refresh.clicked.connect(lambda: self.refresh())
+        top_row.addWidget(self.btn_refresh)
+
+        main_layout.addWidget(filter_frame)
+
+        # Tabla de ejecuciones
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+        content = QHBoxLayout()
+        content.setSpacing(12)
+        content.addWidget(self.table, 3)
+        content.addWidget(self._build_roa_panel(), 2)
+        main_layout.addLayout(content, 1)
+
+        self.combo_control.currentTextChanged.connect(lambda _: self.refresh())
+        self.combo_result.currentTextChanged.connect(lambda _: self.refresh())
+
+    def _build_roa_panel(self):
+        frame = QFrame()
+        frame.setFrameStyle(QFrame.Shape.Box)
+        frame.setLineWidth(1)
+        frame.setStyleSheet("QFrame { border-color: #6272a4; }")
+
+        layout = QVBoxLayout(frame)
+        layout.setContentsMargins(12, 12, 12, 12)
+        layout.setSpacing(8)
+
+        row = QHBoxLayout()
+        row.addWidget(QLabel("Región de atracción:"))
+        self.combo_roa_control = QComboBox()
+        self.combo_roa_control.addItems(list(ROA_CONTROLLERS))
+        row.addWidget(self.combo_roa_control)
+        self.combo_roa_resolution = QComboBox()
+        self.combo_roa_resolution.addItems(["128", "256", "512"])
+        self.combo_roa_resolution.setCurrentText("256")
+        row.addWidget(self.combo_roa_resolution)
+        row.addStretch(1)
+        self.btn_roa = QPushButton("Calcular")
+        self.btn_roa.clicked.connect(lambda: self.compute_roa())
+        row.addWidget(self.btn_roa)
+        layout.addLayout(row)
+
+        self.lbl_roa = QLabel("Verde: recupera · Rojo: cae · Gris: sin decidir")
+        self.lbl_roa.setWordWrap(True)
+        layout.addWidget(self.lbl_roa)
+
+        self.roa_plot = pg.PlotWidget(background=DRACULA["panel"])
+        self.roa_plot.setLabel("bottom", "θ (rad)")
+        self.roa_plot.setLabel("left", "θ' (rad/s)")
+        self.roa_image = pg.ImageItem(axisOrder="row-major")
+        lut = np.array(
+            [
+                pg.mkColor(DRACULA["red"]).getRgb()[:3],
+                pg.mkColor(DRACULA["green"]).getRgb()[:3],
+                pg.mkColor(DRACULA["current_line"]).getRgb()[:3],
+            ],
+            dtype=np.ubyte,
+        )
+        self.roa_image.setLookupTable(lut)
+        self.roa_plot.addItem(self.roa_image)
+        layout.addWidget(self.roa_plot, 1)
+        return frame
+
+    def compute_roa(self):
+        """Calcula (o lee de la caché) el mapa del controlador seleccionado."""
+        if self._roa_worker is not None:
+            return
+        name = self.combo_roa_control.currentText()
+        kwargs = dict(
+            controller=ROA_CONTROLLERS[name](self.roa_params),
+            params=self.roa_params,
+            resolution=int(self.combo_roa_resolution.currentText()),
+            cache_dir=self.roa_cache_dir,
+        )
+        self.btn_roa.setEnabled(False)
+        self.lbl_roa.setText(f"Calculando región de atracción ({name})…")
+        self._roa_worker = _RoaWorker(kwargs, self)
+        self._roa_worker.done.connect(self.show_roa)
+        self._roa_worker.failed.connect(self._roa_failed)
+        self._roa_worker.start()
+
+    def _release_roa_worker(self):
+        if self._roa_worker is not None:
+            self._roa_worker.wait()
+            self._roa_worker = None
+        self.btn_roa.setEnabled(True)
+
+    def _roa_failed(self, message: str):
+        self._release_roa_worker()
+        self.lbl_roa.setText(f"Error al calcular la región de atracción: {message}")
+
+    def show_roa(self, roa):
+        """Pinta un `RoaMap` como mapa de calor."""
+        self._release_roa_worker()
+
+        self.roa_image.setImage(roa.label, levels=(0, 3), autoLevels=False)
+        th, thd = roa.theta, roa.theta_dot
+        self.roa_image.setRect(
+            QRectF(th[0], thd[0], th[-1] - th[0], thd[-1] - thd[0])
+        )
+        recovered = float((roa.label == 1).mean())
+        source = "caché" if roa.elapsed == 0.0 else f"{roa.elapsed:.1f} s"
+        self.lbl_roa.setText(
+            f"{recovered:.0%} de la rejilla recupera · "
+            f"{roa.simulated} celdas simuladas ({source})"
+        )
+
+    def _filters(self):
+        filters = {}
+        control = self.combo_control.currentText()
+        if control and control != self.ALL:
+            filters["controller"] = control
+        result = self.combo_result.currentText()
+        if result != self.ALL:
+            filters["success"] = result == "Éxito"
+        return filters
+
+    def _sync_controllers(self):
+        current = self.combo_control.currentText() or self.ALL
+        items = [self.ALL] + self.db.controllers()
+        existing = [
+            self.combo_control.itemText(i) for i in range(self.combo_control.count())
+        ]
+        if items == existing:
+            return
+        self.combo_control.blockSignals(True)
+        self.combo_control.clear()
+        self.combo_control.addItems(items)
+        self.combo_control.setCurrentText(current if current in items else self.ALL)
+        self.combo_control.blockSignals(False)
+
+    def refresh(self, limit: int = 200):
+        """Vuelve a consultar la base de datos con los filtros actuales."""
+        self._sync_controllers()
+        filters = self._filters()
+        runs = self.db.query_runs(limit=limit, **filters)
+        total = self.db.count_runs(**filters)
+        self.lbl_count.setText(f"{len(runs)} de {total} ejecuciones")
+
+        self.table.setRowCount(len(runs))
+        for row, run in enumerate(runs):
+            success = run["success"]
+            values = (
+                str(run["id"]),
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(run["created"])),
+                run["controller"],
+                "" if run["l"] is None else f"{run['l']:g}",
+                "" if success is None else ("✔" if success else "✘"),
+                "" if run["duration"] is None else f"{run['duration']:.1f}",
+                f"{run['metrics'].get('max_abs_theta', float('nan')):.3f}",
+            )
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.table.setItem(row, col, item)
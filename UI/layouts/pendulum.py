@@ -8,6 +8,7 @@ from PySide6.QtWidgets import (
     QSizePolicy,
     QFrame,
     QSpacerItem,
+    QCheckBox,
 )
 from PySide6.QtCore import Qt, QTimer
 
@@ -72,6 +73,17 @@ class PendulumPage(QWidget):
         top_row.addWidget(lbl_control)
         top_row.addWidget(self.combo_control)
 
+        # Número de eslabones (1 = péndulo simple; >1 usa MultiLinkPendulumData)
+        lbl_links = QLabel("Eslabones:")
+        lbl_links.setAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
+        self.combo_links = QComboBox()
+        self.combo_links.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        self.combo_links.addItems(["1", "2", "3"])
+        self.combo_links.currentTextChanged.connect(self._on_links_changed)
+
+        top_row.addWidget(lbl_links)
+        top_row.addWidget(self.combo_links)
+
         # Espacio separador
         top_row.addSpacing(16)
 
@@ -86,6 +98,15 @@ class PendulumPage(QWidget):
         top_row.addWidget(lbl_com)
         top_row.addWidget(self.combo_com)
 
+        # Espacio separador
+        top_row.addSpacing(16)
+
+        # Superposiciones opcionales del dibujo
+        self.chk_trails = QCheckBox("Estela")
+        self.chk_phase = QCheckBox("Fase")
+        top_row.addWidget(self.chk_trails)
+        top_row.addWidget(self.chk_phase)
+
         # Espacio separador
         top_row.addStretch(1)
 
@@ -98,8 +119,14 @@ class PendulumPage(QWidget):
         self.btn_stop.setFixedSize(44, 36)
         self.btn_stop.clicked.connect(self._on_stop)
 
+        # Reiniciar: termina la ejecución y empieza otra desde un estado nuevo
+        self.btn_reset = QPushButton("⏮️")
+        self.btn_reset.setFixedSize(44, 36)
+        self.btn_reset.clicked.connect(self._on_reset)
+
         top_row.addWidget(self.btn_run)
         top_row.addWidget(self.btn_stop)
+        top_row.addWidget(self.btn_reset)
 
         control_layout.addLayout(top_row)
         main_layout.addWidget(control_frame)
@@ -119,6 +146,9 @@ class PendulumPage(QWidget):
         self.pendulum_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         visualization_layout.addWidget(self.pendulum_widget)
 
+        self.chk_trails.toggled.connect(self.pendulum_widget.set_trails_enabled)
+        self.chk_phase.toggled.connect(self.pendulum_widget.set_phase_portrait_enabled)
+
         # Añadir el marco de visualización con un factor de estiramiento
         main_layout.addWidget(visualization_frame, 1)  # El factor 1 hace que se expanda
 
@@ -149,6 +179,9 @@ class PendulumPage(QWidget):
     def _on_control_changed(self, text: str):
         print(f"[Pendulum] Tipo de control seleccionado: {text}")
 
+    def _on_links_changed(self, text: str):
+        print(f"[Pendulum] Eslabones: {text}")
+
     def _on_com_changed(self, text: str):
         print(f"[Pendulum] Puerto COM seleccionado: {text}")
 
@@ -160,6 +193,9 @@ class PendulumPage(QWidget):
     def _on_stop(self):
         print("[Pendulum] Parar -> Stop pressed")
 
+    def _on_reset(self):
+        print("[Pendulum] Reiniciar -> Reset pressed")
+
     # ----------------- Interfaz para actualizar el péndulo -----------------
     def update_pendulum_state(self, cart_pos, cart_vel, theta, theta_dot):
         """Recibe las variables y las pasa al widget para su representación visual.
@@ -168,6 +204,11 @@ class PendulumPage(QWidget):
         """
         self.pendulum_widget.set_state(cart_pos, cart_vel, theta, theta_dot)
 
+    def set_link_ratios(self, link_ratios):
+        """Reparto de la varilla entre eslabones para el dibujo (None = uno solo)."""
+        self.pendulum_widget.link_ratios = link_ratios
+        self.pendulum_widget.update()
+
 
 # # Si se ejecuta este archivo como script, hacemos una demo con datos aleatorios
 # if __name__ == "__main__":
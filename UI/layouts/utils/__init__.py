@@ -1 +1,11 @@
 from .random_pendulum_data import *
+from .fast_pendulum_data import *
+from .trajectory_export import *
+from .telemetry import *
+from .experiment_db import *
+from .multilink_pendulum_data import *
+from .linear_pendulum_data import *
+from .controllers import *
+from .region_of_attraction import *
+from .kernels import *
+from .sensor_pipeline import *
@@ -0,0 +1,95 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .linear_pendulum_data import discretize
+
+
+def solve_dare(
+    A: np.ndarray,
+    B: np.ndarray,
+    Q: np.ndarray,
+    R: np.ndarray,
+    tol: float = 1e-12,
+    max_iter: int = 100,
+) -> np.ndarray:
+    """Resuelve la ecuación algebraica de Riccati discreta (DARE).
+
+    Usa el algoritmo de doblado estructurado (SDA), que converge
+    cuadráticamente en pocas decenas de iteraciones sin SciPy.
+    """
+    n = A.shape[0]
+    I = np.eye(n)
+    Ak = np.array(A, dtype=float)
+    Gk = B @ np.linalg.solve(R, B.T)
+    Hk = np.array(Q, dtype=float)
+    for _ in range(max_iter):
+        W = I + Gk @ Hk
+        WA = np.linalg.solve(W, Ak)
+        WG = np.linalg.solve(W, Gk)
+        H_next = Hk + Ak.T @ Hk @ WA
+        Gk = Gk + Ak @ WG @ Ak.T
+        Ak = Ak @ WA
+        H_next = 0.5 * (H_next + H_next.T)
+        if np.abs(H_next - Hk).max() <= tol * max(1.0, np.abs(H_next).max()):
+            return H_next
+        Hk = H_next
+    raise RuntimeError("solve_dare no convergió")
+
+
+def dlqr(A: np.ndarray, B: np.ndarray, Q: np.ndarray, R: np.ndarray) -> np.ndarray:
+    """Ganancia LQR discreta K (1 x n o m x n) para F = -K x."""
+    P = solve_dare(A, B, Q, R)
+    return np.linalg.solve(R + B.T @ P @ B, B.T @ P @ A)
+
+
+def lqr_gain(
+    M: float = 1.0,
+    m: float = 0.1,
+    l: float = 0.5,
+    g: float = 9.81,
+    b: float = 0.0,
+    dt: float = 0.02,
+    Q: Optional[Sequence[float]] = None,
+    R: float = 0.1,
+) -> np.ndarray:
+    """Ganancia LQR para los parámetros de `RandomPendulumData` (vector de 4).
+
+    Q es la diagonal de pesos de (x, x_dot, theta, theta_dot).
+    """
+    A, B = discretize(M, m, l, g, b, dt)
+    Qm = np.diag([1.0, 1.0, 10.0, 1.0] if Q is None else Q)
+    Rm = np.array([[float(R)]])
+    return dlqr(A, B, Qm, Rm)[0]
+
+
+class LinearStateFeedback:
+    """Controlador F = -K x compatible con `control_func(state, t)`.
+
+    Acepta el estado escalar de `RandomPendulumData` (tupla de 4, retorna
+    float) o un lote (batch, 4) de `MultiLinkPendulumData` con un eslabón
+    (retorna array (batch,)). El modo lineal usa `K` para calcular el lazo
+    cerrado exacto sin llamar al controlador.
+
+    `linear_feedback` marca que `__call__` es exactamente F = -K x: los
+    núcleos y el modo lineal usan entonces K sin llamar al controlador. Una
+    subclase que cambie `__call__` debe ponerlo a False.
+    """
+
+    linear_feedback = True
+
+    def __init__(self, K: Sequence[float]):
+        self.K = np.asarray(K, dtype=float).ravel()
+        self._k = tuple(self.K.tolist())
+
+    @classmethod
+    def lqr(cls, **params):
+        """Crea el controlador con `lqr_gain(**params)`."""
+        return cls(lqr_gain(**params))
+
+    def __call__(self, state, t=0.0):
+        if isinstance(state, np.ndarray) and state.ndim > 1:
+            return -(state @ self.K)
+        k0, k1, k2, k3 = self._k
+        x, x_dot, theta, theta_dot = state
+        return -(k0 * x + k1 * x_dot + k2 * theta + k3 * theta_dot)
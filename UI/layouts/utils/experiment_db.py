@@ -0,0 +1,268 @@
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+# Campos de `runs` que se pueden filtrar directamente en `query_runs`
+RUN_FIELDS = (
+    "created",
+    "controller",
+    "M",
+    "m",
+    "l",
+    "g",
+    "b",
+    "track_half_range",
+    "seed",
+    "port",
+    "success",
+    "duration",
+    "telemetry_path",
+    "notes",
+)
+
+# SQLite no distingue mayúsculas en nombres de columna: M y m se renombran
+_COLUMNS = {"M": "cart_mass", "m": "pole_mass"}
+_FIELDS = {column: field for field, column in _COLUMNS.items()}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    controller TEXT NOT NULL,
+    cart_mass REAL, pole_mass REAL, l REAL, g REAL, b REAL, track_half_range REAL,
+    seed INTEGER,
+    port TEXT,
+    success INTEGER,
+    duration REAL,
+    telemetry_path TEXT,
+    notes TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_runs_controller_l ON runs(controller, l, success);
+CREATE INDEX IF NOT EXISTS idx_runs_success ON runs(success, created);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created);
+CREATE INDEX IF NOT EXISTS idx_runs_seed ON runs(seed);
+CREATE INDEX IF NOT EXISTS idx_metrics_name_value ON metrics(name, value);
+"""
+
+
+class ExperimentDB:
+    """Base de datos local (SQLite) de ejecuciones, parámetros y métricas.
+
+    Cada ejecución guarda el controlador (`combo_control`), los parámetros
+    físicos de `RandomPendulumData`, semilla, puerto, métricas resumen y la
+    ruta del fichero con la telemetría completa (ver `trajectory_export`).
+
+    Ejemplo:
+        db = ExperimentDB("experiments.sqlite")
+        db.query_runs(controller="LQR + Swim up", l=0.5, success=False)
+    """
+
+    def __init__(self, path: str = "experiments.sqlite"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ----------------- Inserción -----------------
+    def add_run(
+        self,
+        controller: str,
+        params: Optional[Dict[str, float]] = None,
+        metrics: Optional[Dict[str, float]] = None,
+        **fields: Any,
+    ) -> int:
+        """Registra una ejecución y retorna su id.
+
+        - params: parámetros físicos (M, m, l, g, b, track_half_range)
+        - metrics: métricas resumen {nombre: valor}
+        - fields: seed, port, success, duration, telemetry_path, notes, created
+        """
+        run = dict(fields, controller=controller, params=params, metrics=metrics)
+        return self.add_runs([run])[0]
+
+    def add_runs(self, runs: Iterable[Dict[str, Any]]) -> List[int]:
+        """Inserta muchas ejecuciones (p. ej. un barrido) en una sola transacción.
+
+        Cada elemento es un dict con las mismas claves que `add_run`.
+        """
+        ids = []
+        metric_rows = []
+        now = time.time()
+        with self.conn:
+            cur = self.conn.cursor()
+            for run in runs:
+                row = dict(run.get("params") or {})
+                for key in RUN_FIELDS:
+                    if key in run:
+                        row[key] = run[key]
+                row.setdefault("created", now)
+                unknown = set(row) - set(RUN_FIELDS)
+                if unknown:
+                    raise ValueError(f"Campos desconocidos: {sorted(unknown)}")
+                if "success" in row and row["success"] is not None:
+                    row["success"] = int(bool(row["success"]))
+
+                cols = ", ".join(_COLUMNS.get(k, k) for k in row)
+                marks = ", ".join("?" * len(row))
+                cur.execute(
+                    f"INSERT INTO runs ({cols}) VALUES ({marks})", tuple(row.values())
+                )
+                run_id = cur.lastrowid
+                ids.append(run_id)
+                for name, value in (run.get("metrics") or {}).items():
+                    metric_rows.append((run_id, name, float(value)))
+            cur.executemany(
+                "INSERT INTO metrics (run_id, name, value) VALUES (?, ?, ?)",
+                metric_rows,
+            )
+        return ids
+
+    def set_metrics(self, run_id: int, metrics: Dict[str, float]):
+        """Añade o reemplaza métricas de una ejecución existente."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO metrics (run_id, name, value) VALUES (?, ?, ?)",
+                [(run_id, k, float(v)) for k, v in metrics.items()],
+            )
+
+    # ----------------- Consultas -----------------
+    def query_runs(
+        self,
+        limit: Optional[int] = 100,
+        order_by: str = "created DESC",
+        metric_min: Optional[Dict[str, float]] = None,
+        metric_max: Optional[Dict[str, float]] = None,
+        with_metrics: bool = True,
+        **filters: Any,
+    ) -> List[Dict[str, Any]]:
+        """Busca ejecuciones.
+
+        Los filtros son igualdades sobre `RUN_FIELDS` (`controller="LQR"`,
+        `l=0.5`, `success=False`). Para rangos usa `<campo>__min` / `<campo>__max`
+        (`created__min=t0`). `metric_min` / `metric_max` filtran por métricas:
+        `metric_max={"max_abs_theta": 0.2}`.
+        """
+        where, args = self._where(filters, metric_min, metric_max)
+
+        order_field, _, direction = order_by.partition(" ")
+        if order_field not in RUN_FIELDS + ("id",) or direction.upper() not in (
+            "",
+            "ASC",
+            "DESC",
+        ):
+            raise ValueError(f"Orden no válido: {order_by}")
+
+        order_column = _COLUMNS.get(order_field, order_field)
+        sql = f"SELECT r.* FROM runs r{where} ORDER BY r.{order_column} {direction}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+
+        runs = [self._row_to_run(row) for row in self.conn.execute(sql, args)]
+        if with_metrics and runs:
+            self._attach_metrics(runs)
+        return runs
+
+    @staticmethod
+    def _where(filters, metric_min, metric_max):
+        """Construye la cláusula WHERE (con espacio inicial) y sus argumentos."""
+        where = []
+        args: List[Any] = []
+        for key, value in filters.items():
+            field, _, op = key.partition("__")
+            if field not in RUN_FIELDS or op not in ("", "min", "max"):
+                raise ValueError(f"Filtro desconocido: {key}")
+            if field == "success" and value is not None:
+                value = int(bool(value))
+            column = _COLUMNS.get(field, field)
+            if op == "min":
+                where.append(f"r.{column} >= ?")
+            elif op == "max":
+                where.append(f"r.{column} <= ?")
+            elif value is None:
+                where.append(f"r.{column} IS NULL")
+                continue
+            else:
+                where.append(f"r.{column} = ?")
+            args.append(value)
+
+        for bounds, op in ((metric_min, ">="), (metric_max, "<=")):
+            for name, value in (bounds or {}).items():
+                # Subconsulta servida por idx_metrics_name_value
+                where.append(
+                    "r.id IN (SELECT run_id FROM metrics"
+                    f" WHERE name = ? AND value {op} ?)"
+                )
+                args.extend((name, value))
+        clause = " WHERE " + " AND ".join(where) if where else ""
+        return clause, args
+
+    @staticmethod
+    def _row_to_run(row: sqlite3.Row) -> Dict[str, Any]:
+        return {_FIELDS.get(k, k): row[k] for k in row.keys()}
+
+    def _attach_metrics(self, runs: List[Dict[str, Any]]):
+        by_id = {run["id"]: run for run in runs}
+        for run in runs:
+            run["metrics"] = {}
+        ids = list(by_id)
+        # SQLite limita el nº de parámetros por consulta: ir por bloques
+        for i in range(0, len(ids), 500):
+            block = ids[i : i + 500]
+            marks = ", ".join("?" * len(block))
+            for run_id, name, value in self.conn.execute(
+                f"SELECT run_id, name, value FROM metrics WHERE run_id IN ({marks})",
+                block,
+            ):
+                by_id[run_id]["metrics"][name] = value
+
+    def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        run = self._row_to_run(row)
+        self._attach_metrics([run])
+        return run
+
+    def controllers(self) -> List[str]:
+        """Controladores distintos registrados (para poblar filtros de la UI)."""
+        return [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT DISTINCT controller FROM runs ORDER BY controller"
+            )
+        ]
+
+    def count_runs(
+        self,
+        metric_min: Optional[Dict[str, float]] = None,
+        metric_max: Optional[Dict[str, float]] = None,
+        **filters: Any,
+    ) -> int:
+        """Número de ejecuciones que cumplen los mismos filtros que `query_runs`."""
+        where, args = self._where(filters, metric_min, metric_max)
+        sql = f"SELECT COUNT(*) FROM runs r{where}"
+        return self.conn.execute(sql, args).fetchone()[0]
+
+    def delete_run(self, run_id: int):
+        with self.conn:
+            self.conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
@@ -0,0 +1,220 @@
+from math import sin, cos, pi
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from .random_pendulum_data import _SnapshotMixin
+from .kernels import get_backend, linear_gain, substeps
+
+
+class FastPendulumData(_SnapshotMixin):
+    """Núcleo escalar de `RandomPendulumData` sin asignaciones por paso.
+
+    Misma física, mismos parámetros y misma interfaz `next(dt)`, pero el estado
+    vive en `__slots__` y las cuatro etapas de RK4 se calculan en variables
+    locales (sin tuplas intermedias ni generadores). Las operaciones se hacen en
+    el mismo orden que `RandomPendulumData`, así que los resultados son
+    idénticos bit a bit para el mismo dt.
+
+    Para lazos en tiempo real conviene `advance(n, dt)`, que equivale a llamar
+    `next(dt)` n veces pero con una sola llamada Python.
+
+    Sin controlador o con un `LinearStateFeedback` la integración la hace el
+    backend activo de `kernels` (numba o Python); el bucle de aquí sólo se usa
+    con un `control_func` arbitrario.
+    """
+
+    __slots__ = (
+        "M",
+        "m",
+        "l",
+        "g",
+        "b",
+        "track_half_range",
+        "control_func",
+        "x",
+        "x_dot",
+        "theta",
+        "theta_dot",
+        "t",
+    )
+
+    def __init__(
+        self,
+        M: float = 1.0,
+        m: float = 0.1,
+        l: float = 0.5,
+        g: float = 9.81,
+        b: float = 0.0,
+        track_half_range: float = 2.0,
+        control_func: Optional[
+            Callable[[Tuple[float, float, float, float], float], float]
+        ] = None,
+    ):
+        # physical parameters
+        self.M = float(M)
+        self.m = float(m)
+        self.l = float(l)
+        self.g = float(g)
+        self.b = float(b)
+
+        # clipping / normalization
+        self.track_half_range = float(track_half_range)
+
+        # controller (callable(state, t) -> force)
+        self.control_func = control_func
+
+        # initial state: x, x_dot, theta, theta_dot (same as RandomPendulumData)
+        self.x = 0.0
+        self.x_dot = 0.0
+        self.theta = 0.05
+        self.theta_dot = 0.0
+
+        # internal time
+        self.t = 0.0
+
+    def _integrate(self, steps: int, dt: float):
+        """Aplica `steps` pasos RK4 de tamaño `dt` trabajando sobre locales."""
+        gain = linear_gain(self.control_func)
+        if gain is not None:
+            state = np.array((self.x, self.x_dot, self.theta, self.theta_dot))
+            self.t = get_backend().integrate(
+                state, self.t, steps, dt, self.M, self.m, self.l, self.g, self.b, *gain
+            )
+            self.x, self.x_dot, self.theta, self.theta_dot = state.tolist()
+            return
+
+        # Arbitrary control_func: same RK4 as kernels.rk4_integrate, calling ctrl
+
+        M = self.M
+        m = self.m
+        l = self.l
+        g = self.g
+        b = self.b
+        ctrl = self.control_func
+        # Sampled controllers (`sampled`): call at k1 only, hold F for k2..k4
+        held = getattr(ctrl, "sampled", False)
+
+        # Constants reused by every stage
+        Mm = M + m
+        ml = m * l
+        four_thirds = 4.0 / 3.0
+        half_dt = 0.5 * dt
+        sixth_dt = dt / 6.0
+        two_pi = 2 * pi
+
+        x = self.x
+        x_dot = self.x_dot
+        theta = self.theta
+        theta_dot = self.theta_dot
+        t = self.t
+
+        for _ in range(steps):
+            # --- k1 (state0) ---
+            F = ctrl((x, x_dot, theta, theta_dot), t)
+            sin_t = sin(theta)
+            cos_t = cos(theta)
+            denom = l * (four_thirds - (m * cos_t * cos_t) / Mm)
+            k1_thdd = (
+                g * sin_t
+                + cos_t * ((-F - ml * theta_dot * theta_dot * sin_t + b * x_dot) / Mm)
+            ) / denom
+            k1_xdd = (
+                F + ml * (theta_dot * theta_dot * sin_t - k1_thdd * cos_t) - b * x_dot
+            ) / Mm
+            k1_x = x_dot
+            k1_th = theta_dot
+
+            # --- k2 (state0 + dt/2 * k1) ---
+            s_x = x + half_dt * k1_x
+            s_xd = x_dot + half_dt * k1_xdd
+            s_th = theta + half_dt * k1_th
+            s_thd = theta_dot + half_dt * k1_thdd
+            if not held:
+                F = ctrl((s_x, s_xd, s_th, s_thd), t + half_dt)
+            sin_t = sin(s_th)
+            cos_t = cos(s_th)
+            denom = l * (four_thirds - (m * cos_t * cos_t) / Mm)
+            k2_thdd = (
+                g * sin_t + cos_t * ((-F - ml * s_thd * s_thd * sin_t + b * s_xd) / Mm)
+            ) / denom
+            k2_xdd = (F + ml * (s_thd * s_thd * sin_t - k2_thdd * cos_t) - b * s_xd) / Mm
+            k2_x = s_xd
+            k2_th = s_thd
+
+            # --- k3 (state0 + dt/2 * k2) ---
+            s_x = x + half_dt * k2_x
+            s_xd = x_dot + half_dt * k2_xdd
+            s_th = theta + half_dt * k2_th
+            s_thd = theta_dot + half_dt * k2_thdd
+            if not held:
+                F = ctrl((s_x, s_xd, s_th, s_thd), t + half_dt)
+            sin_t = sin(s_th)
+            cos_t = cos(s_th)
+            denom = l * (four_thirds - (m * cos_t * cos_t) / Mm)
+            k3_thdd = (
+                g * sin_t + cos_t * ((-F - ml * s_thd * s_thd * sin_t + b * s_xd) / Mm)
+            ) / denom
+            k3_xdd = (F + ml * (s_thd * s_thd * sin_t - k3_thdd * cos_t) - b * s_xd) / Mm
+            k3_x = s_xd
+            k3_th = s_thd
+
+            # --- k4 (state0 + dt * k3) ---
+            s_x = x + dt * k3_x
+            s_xd = x_dot + dt * k3_xdd
+            s_th = theta + dt * k3_th
+            s_thd = theta_dot + dt * k3_thdd
+            if not held:
+                F = ctrl((s_x, s_xd, s_th, s_thd), t + dt)
+            sin_t = sin(s_th)
+            cos_t = cos(s_th)
+            denom = l * (four_thirds - (m * cos_t * cos_t) / Mm)
+            k4_thdd = (
+                g * sin_t + cos_t * ((-F - ml * s_thd * s_thd * sin_t + b * s_xd) / Mm)
+            ) / denom
+            k4_xdd = (F + ml * (s_thd * s_thd * sin_t - k4_thdd * cos_t) - b * s_xd) / Mm
+
+            # --- combine ---
+            x = x + sixth_dt * (k1_x + 2 * k2_x + 2 * k3_x + s_xd)
+            x_dot = x_dot + sixth_dt * (k1_xdd + 2 * k2_xdd + 2 * k3_xdd + k4_xdd)
+            theta = theta + sixth_dt * (k1_th + 2 * k2_th + 2 * k3_th + s_thd)
+            theta_dot = theta_dot + sixth_dt * (
+                k1_thdd + 2 * k2_thdd + 2 * k3_thdd + k4_thdd
+            )
+            t += dt
+
+            # Normalize theta to [-pi, pi] (skip diverged values, as the kernels do)
+            if abs(theta) < 1e6:
+                while theta > pi:
+                    theta -= two_pi
+                while theta < -pi:
+                    theta += two_pi
+
+        self.x = x
+        self.x_dot = x_dot
+        self.theta = theta
+        self.theta_dot = theta_dot
+        self.t = t
+
+    def _substeps(self, dt: float):
+        return substeps(dt)
+
+    def _output(self):
+        x_norm = self.x / self.track_half_range
+        if x_norm < -1.0:
+            x_norm = -1.0
+        elif x_norm > 1.0:
+            x_norm = 1.0
+        return x_norm, self.x_dot, self.theta, self.theta_dot
+
+    def next(self, dt: float = 0.02):
+        """Avanza dt segundos y retorna (x_norm, x_dot, theta, theta_dot)."""
+        steps, sub_dt = self._substeps(dt)
+        self._integrate(steps, sub_dt)
+        return self._output()
+
+    def advance(self, n: int, dt: float = 0.02):
+        """Equivale a `n` llamadas a `next(dt)`; retorna sólo el estado final."""
+        steps, sub_dt = self._substeps(dt)
+        self._integrate(n * steps, sub_dt)
+        return self._output()
@@ -0,0 +1,291 @@
+import os
+from math import sin, cos, pi
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    HAVE_NUMBA = True
+except ImportError:  # sin numba sólo queda el backend "python"
+    njit = prange = None
+    HAVE_NUMBA = False
+
+
+def rk4_integrate(state, t, steps, dt, M, m, l, g, b, K, use_K):
+    """Aplica `steps` pasos RK4 sobre `state` (array (4,), se modifica) y
+    retorna el tiempo final."""
+    Mm = M + m
+    ml = m * l
+    four_thirds = 4.0 / 3.0
+    half_dt = 0.5 * dt
+    sixth_dt = dt / 6.0
+    two_pi = 2 * pi
+    k0 = float(K[0])
+    k1 = float(K[1])
+    k2 = float(K[2])
+    k3 = float(K[3])
+
+    x = float(state[0])
+    x_dot = float(state[1])
+    theta = float(state[2])
+    theta_dot = float(state[3])
+
+    for _ in range(steps):
+        # --- k1 (state0) ---
+        F = -(k0 * x + k1 * x_dot + k2 * theta + k3 * theta_dot) if use_K else 0.0
+        sin_t = sin(theta)
+        cos_t = cos(theta)
+        denom = l * (four_thirds - (m * cos_t * cos_t) / Mm)
+        k1_thdd = (
+            g * sin_t
+            + cos_t * ((-F - ml * theta_dot * theta_dot * sin_t + b * x_dot) / Mm)
+        ) / denom
+        k1_xdd = (
+            F + ml * (theta_dot * theta_dot * sin_t - k1_thdd * cos_t) - b * x_dot
+        ) / Mm
+        k1_x = x_dot
+        k1_th = theta_dot
+
+        # --- k2 (state0 + dt/2 * k1) ---
+        s_x = x + half_dt * k1_x
+        s_xd = x_dot + half_dt * k1_xdd
+        s_th = theta + half_dt * k1_th
+        s_thd = theta_dot + half_dt * k1_thdd
+        F = -(k0 * s_x + k1 * s_xd + k2 * s_th + k3 * s_thd) if use_K else 0.0
+        sin_t = sin(s_th)
+        cos_t = cos(s_th)
+        denom = l * (four_thirds - (m * cos_t * cos_t) / Mm)
+        k2_thdd = (
+            g * sin_t + cos_t * ((-F - ml * s_thd * s_thd * sin_t + b * s_xd) / Mm)
+        ) / denom
+        k2_xdd = (F + ml * (s_thd * s_thd * sin_t - k2_thdd * cos_t) - b * s_xd) / Mm
+        k2_x = s_xd
+        k2_th = s_thd
+
+        # --- k3 (state0 + dt/2 * k2) ---
+        s_x = x + half_dt * k2_x
+        s_xd = x_dot + half_dt * k2_xdd
+        s_th = theta + half_dt * k2_th
+        s_thd = theta_dot + half_dt * k2_thdd
+        F = -(k0 * s_x + k1 * s_xd + k2 * s_th + k3 * s_thd) if use_K else 0.0
+        sin_t = sin(s_th)
+        cos_t = cos(s_th)
+        denom = l * (four_thirds - (m * cos_t * cos_t) / Mm)
+        k3_thdd = (
+            g * sin_t + cos_t * ((-F - ml * s_thd * s_thd * sin_t + b * s_xd) / Mm)
+        ) / denom
+        k3_xdd = (F + ml * (s_thd * s_thd * sin_t - k3_thdd * cos_t) - b * s_xd) / Mm
+        k3_x = s_xd
+        k3_th = s_thd
+
+        # --- k4 (state0 + dt * k3) ---
+        s_x = x + dt * k3_x
+        s_xd = x_dot + dt * k3_xdd
+        s_th = theta + dt * k3_th
+        s_thd = theta_dot + dt * k3_thdd
+        F = -(k0 * s_x + k1 * s_xd + k2 * s_th + k3 * s_thd) if use_K else 0.0
+        sin_t = sin(s_th)
+        cos_t = cos(s_th)
+        denom = l * (four_thirds - (m * cos_t * cos_t) / Mm)
+        k4_thdd = (
+            g * sin_t + cos_t * ((-F - ml * s_thd * s_thd * sin_t + b * s_xd) / Mm)
+        ) / denom
+        k4_xdd = (F + ml * (s_thd * s_thd * sin_t - k4_thdd * cos_t) - b * s_xd) / Mm
+
+        # --- combine ---
+        x = x + sixth_dt * (k1_x + 2 * k2_x + 2 * k3_x + s_xd)
+        x_dot = x_dot + sixth_dt * (k1_xdd + 2 * k2_xdd + 2 * k3_xdd + k4_xdd)
+        theta = theta + sixth_dt * (k1_th + 2 * k2_th + 2 * k3_th + s_thd)
+        theta_dot = theta_dot + sixth_dt * (
+            k1_thdd + 2 * k2_thdd + 2 * k3_thdd + k4_thdd
+        )
+        t += dt
+
+        # Normalize theta to [-pi, pi] (skip diverged values: the loops would
+        # not end for inf/nan or take forever for huge angles)
+        if abs(theta) < 1e6:
+            while theta > pi:
+                theta -= two_pi
+            while theta < -pi:
+                theta += two_pi
+
+    state[0] = x
+    state[1] = x_dot
+    state[2] = theta
+    state[3] = theta_dot
+    return t
+
+
+def rk4_integrate_batch_numpy(states, steps, dt, M, m, l, g, b, K, use_K):
+    """`rk4_integrate` vectorizado con NumPy sobre `states` (n, 4), in situ."""
+    Mm = M + m
+    ml = m * l
+    four_thirds = 4.0 / 3.0
+    half_dt = 0.5 * dt
+    sixth_dt = dt / 6.0
+    two_pi = 2 * pi
+    k0, k1, k2, k3 = (float(k) for k in K)
+
+    x = states[:, 0].copy()
+    x_dot = states[:, 1].copy()
+    theta = states[:, 2].copy()
+    theta_dot = states[:, 3].copy()
+
+    def stage(s_x, s_xd, s_th, s_thd):
+        if use_K:
+            F = -(k0 * s_x + k1 * s_xd + k2 * s_th + k3 * s_thd)
+        else:
+            F = 0.0
+        sin_t = np.sin(s_th)
+        cos_t = np.cos(s_th)
+        denom = l * (four_thirds - (m * cos_t * cos_t) / Mm)
+        thdd = (
+            g * sin_t + cos_t * ((-F - ml * s_thd * s_thd * sin_t + b * s_xd) / Mm)
+        ) / denom
+        xdd = (F + ml * (s_thd * s_thd * sin_t - thdd * cos_t) - b * s_xd) / Mm
+        return xdd, thdd
+
+    for _ in range(steps):
+        k1_xdd, k1_thdd = stage(x, x_dot, theta, theta_dot)
+        s_xd = x_dot + half_dt * k1_xdd
+        s_thd = theta_dot + half_dt * k1_thdd
+        k2_x, k2_th = s_xd, s_thd
+        k2_xdd, k2_thdd = stage(
+            x + half_dt * x_dot, s_xd, theta + half_dt * theta_dot, s_thd
+        )
+        s_xd = x_dot + half_dt * k2_xdd
+        s_thd = theta_dot + half_dt * k2_thdd
+        k3_x, k3_th = s_xd, s_thd
+        k3_xdd, k3_thdd = stage(
+            x + half_dt * k2_x, s_xd, theta + half_dt * k2_th, s_thd
+        )
+        s_xd = x_dot + dt * k3_xdd
+        s_thd = theta_dot + dt * k3_thdd
+        k4_xdd, k4_thdd = stage(x + dt * k3_x, s_xd, theta + dt * k3_th, s_thd)
+
+        x = x + sixth_dt * (x_dot + 2 * k2_x + 2 * k3_x + s_xd)
+        x_dot = x_dot + sixth_dt * (k1_xdd + 2 * k2_xdd + 2 * k3_xdd + k4_xdd)
+        theta = theta + sixth_dt * (theta_dot + 2 * k2_th + 2 * k3_th + s_thd)
+        theta_dot = theta_dot + sixth_dt * (
+            k1_thdd + 2 * k2_thdd + 2 * k3_thdd + k4_thdd
+        )
+
+        # Same repeated +-2pi as the scalar kernel (not a modulo)
+        finite = np.abs(theta) < 1e6
+        over = finite & (theta > pi)
+        while over.any():
+            theta[over] -= two_pi
+            over &= theta > pi
+        under = finite & (theta < -pi)
+        while under.any():
+            theta[under] += two_pi
+            under &= theta < -pi
+
+    states[:, 0] = x
+    states[:, 1] = x_dot
+    states[:, 2] = theta
+    states[:, 3] = theta_dot
+
+
+class Backend(NamedTuple):
+    """Núcleos de dinámica + RK4 de un backend.
+
+    - "numba": `rk4_integrate` compilado con `numba.njit(cache=True)`; la
+      compilación se guarda en __pycache__ y sólo se paga la primera vez. Los
+      lotes se reparten entre núcleos con `prange`.
+    - "python": Python puro para un péndulo y NumPy para lotes.
+
+    Ambos hacen las operaciones en el mismo orden que `RandomPendulumData`,
+    así que los resultados coinciden bit a bit. El único controlador integrado
+    es F = -K x (`LinearStateFeedback`); use_K = False equivale a no tener
+    controlador. Con esos controladores los usan `RandomPendulumData`,
+    `FastPendulumData`, `simulate_cells`, `linear_rollout` y
+    `linear_error_report`.
+
+    integrate(state, t, steps, dt, M, m, l, g, b, K, use_K) -> t
+    integrate_batch(states, steps, dt, M, m, l, g, b, K, use_K) -> None
+    """
+
+    name: str
+    compiled: bool
+    integrate: Callable
+    integrate_batch: Callable
+
+
+BACKENDS = {
+    "python": Backend("python", False, rk4_integrate, rk4_integrate_batch_numpy),
+}
+
+if HAVE_NUMBA:
+    _rk4_integrate_nb = njit(cache=True)(rk4_integrate)
+
+    # Each row is independent: spread them over the available cores
+    @njit(cache=True, parallel=True)
+    def _rk4_integrate_batch_nb(states, steps, dt, M, m, l, g, b, K, use_K):
+        for i in prange(states.shape[0]):
+            _rk4_integrate_nb(states[i], 0.0, steps, dt, M, m, l, g, b, K, use_K)
+
+    BACKENDS["numba"] = Backend(
+        "numba", True, _rk4_integrate_nb, _rk4_integrate_batch_nb
+    )
+
+# IPCS_BACKEND=python fuerza el backend sin compilar (si el pedido no está
+# disponible se usa el mejor instalado)
+_active = BACKENDS.get(
+    os.environ.get("IPCS_BACKEND", ""), BACKENDS["numba" if HAVE_NUMBA else "python"]
+)
+
+
+def get_backend(name: str = None) -> Backend:
+    """Backend por nombre ("numba" / "python"); None retorna el activo."""
+    if name is None:
+        return _active
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Backend no disponible: {name} (disponibles: {sorted(BACKENDS)})"
+        )
+    return BACKENDS[name]
+
+
+def set_backend(name: str) -> Backend:
+    """Cambia el backend activo (el que usan los simuladores escalares y por lotes)."""
+    global _active
+    _active = get_backend(name)
+    return _active
+
+
+def substeps(dt: float, max_substep: float = 0.02) -> Tuple[int, float]:
+    """(nº de subpasos, subpaso) de un paso `dt`, como `RandomPendulumData.next`."""
+    steps = max(1, int(dt / max_substep))
+    return steps, dt / steps
+
+
+def feedback_gain(control_func) -> Optional[np.ndarray]:
+    """Ganancia K (4,) si control_func declara ser F = -K x, o None.
+
+    Solo cuentan los controladores marcados con `linear_feedback = True`
+    (como `LinearStateFeedback`): tener un atributo K no basta, porque el
+    controlador puede calcular otra fuerza en `__call__`.
+    """
+    if not getattr(control_func, "linear_feedback", False):
+        return None
+    K = np.ascontiguousarray(control_func.K, dtype=np.float64).ravel()
+    if K.shape != (4,):
+        return None
+    return K
+
+
+def linear_gain(control_func):
+    """(K, use_K) para los núcleos, o None si control_func no es integrable.
+
+    Sin controlador -> (ceros, False); con un controlador lineal de 4
+    ganancias (ver `feedback_gain`) -> (K, True).
+    """
+    if control_func is None:
+        return np.zeros(4), False
+    K = feedback_gain(control_func)
+    if K is None:
+        return None
+    return K, True
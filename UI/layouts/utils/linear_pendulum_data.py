@@ -0,0 +1,327 @@
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .random_pendulum_data import RandomPendulumData
+from .fast_pendulum_data import FastPendulumData
+from .kernels import feedback_gain, get_backend, linear_gain, substeps
+from .multilink_pendulum_data import SMALL_BATCH
+
+
+def linearize(
+    M: float, m: float, l: float, g: float, b: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Modelo lineal continuo (A, B) de `RandomPendulumData` en theta = 0 (arriba).
+
+    Estado (x, x_dot, theta, theta_dot), entrada F. Se obtiene de
+    `RandomPendulumData._derivatives` con sin(theta) ~ theta, cos(theta) ~ 1 y
+    despreciando theta_dot^2.
+    """
+    total = M + m
+    denom = l * (4.0 / 3.0 - m / total)
+
+    # theta_ddot = a_th_xd * x_dot + a_th_th * theta + b_th * F
+    a_th_xd = b / (total * denom)
+    a_th_th = g / denom
+    b_th = -1.0 / (total * denom)
+
+    A = np.array(
+        [
+            [0.0, 1.0, 0.0, 0.0],
+            [0.0, -(b + m * l * a_th_xd) / total, -m * l * a_th_th / total, 0.0],
+            [0.0, 0.0, 0.0, 1.0],
+            [0.0, a_th_xd, a_th_th, 0.0],
+        ]
+    )
+    B = np.array([[0.0], [(1.0 - m * l * b_th) / total], [0.0], [b_th]])
+    return A, B
+
+
+def expm(A: np.ndarray) -> np.ndarray:
+    """Exponencial de matriz por escalado y cuadrado con serie de Taylor.
+
+    Suficiente para las matrices 4x4/5x5 bien condicionadas de este módulo
+    (evita depender de SciPy).
+    """
+    norm = np.abs(A).sum(axis=1).max()
+    squarings = max(0, int(np.ceil(np.log2(norm / 0.5)))) if norm > 0.5 else 0
+    X = A / (2.0**squarings)
+
+    result = np.eye(A.shape[0])
+    term = np.eye(A.shape[0])
+    for k in range(1, 18):
+        term = term @ X / k
+        result = result + term
+    for _ in range(squarings):
+        result = result @ result
+    return result
+
+
+@lru_cache(maxsize=128)
+def _discretize_cached(M, m, l, g, b, dt, K):
+    A, B = linearize(M, m, l, g, b)
+    if K is not None:
+        # Realimentación continua F = -K x (igual que control_func dentro de RK4)
+        Phi = expm((A - B @ np.asarray(K, float)[None, :]) * dt)
+        Gamma = np.zeros((4, 1))
+    else:
+        # Retención de orden cero de F durante dt: exp([[A, B], [0, 0]] dt)
+        aug = np.zeros((5, 5))
+        aug[:4, :4] = A
+        aug[:4, 4:] = B
+        E = expm(aug * dt)
+        Phi = E[:4, :4].copy()
+        Gamma = E[:4, 4:].copy()
+    Phi.setflags(write=False)
+    Gamma.setflags(write=False)
+    return Phi, Gamma
+
+
+def discretize(
+    M: float,
+    m: float,
+    l: float,
+    g: float,
+    b: float,
+    dt: float,
+    K=None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Matrices discretas (Phi, Gamma) del modelo lineal para un paso dt.
+
+    - Sin K: x[k+1] = Phi x[k] + Gamma F[k] (F retenida durante dt).
+    - Con K (ganancia de `LinearStateFeedback`): lazo cerrado exacto de
+      F = -K x, x[k+1] = Phi x[k] y Gamma = 0.
+
+    El resultado se cachea por (parámetros, dt, K) y es de solo lectura.
+    """
+    if K is not None:
+        K = tuple(float(k) for k in np.ravel(K))
+    return _discretize_cached(
+        float(M), float(m), float(l), float(g), float(b), float(dt), K
+    )
+
+
+def _gain(controller):
+    """Ganancia K de un controlador lineal (o None si no hay controlador)."""
+    if controller is None:
+        return None
+    K = feedback_gain(controller)
+    if K is None:
+        raise ValueError(
+            "El modo lineal solo admite controladores F = -K x marcados con "
+            "linear_feedback (p. ej. LinearStateFeedback) o sin controlador"
+        )
+    return K
+
+
+class LinearRollout(NamedTuple):
+    """Resultado de `linear_rollout`.
+
+    states: array (steps + 1, n, 4) con (x, x_dot, theta, theta_dot)
+    fallback_step: array (n,) con el primer paso integrado con el modelo no
+        lineal (-1 si toda la trayectoria quedó dentro de la región lineal)
+    """
+
+    states: np.ndarray
+    fallback_step: np.ndarray
+
+
+def _closed_loop_powers(Phi: np.ndarray, steps: int) -> np.ndarray:
+    """Potencias Phi^0 .. Phi^steps apiladas en un array (steps + 1, 4, 4)."""
+    powers = np.empty((steps + 1,) + Phi.shape)
+    powers[0] = np.eye(Phi.shape[0])
+    for k in range(1, steps + 1):
+        np.matmul(Phi, powers[k - 1], out=powers[k])
+    return powers
+
+
+def linear_rollout(
+    x0,
+    steps: int,
+    dt: float = 0.02,
+    controller=None,
+    M: float = 1.0,
+    m: float = 0.1,
+    l: float = 0.5,
+    g: float = 9.81,
+    b: float = 0.0,
+    theta_limit: Optional[float] = 0.3,
+    method: str = "recursive",
+) -> LinearRollout:
+    """Simula `steps` pasos de n condiciones iniciales con el modelo lineal.
+
+    - x0: estado inicial (4,) o (n, 4)
+    - controller: None o un controlador lineal con atributo K (F = -K x)
+    - method: "recursive" (un producto (n, 4) x (4, 4) por paso) o "powers"
+      (un solo producto por lotes contra Phi^k; conviene con n grande)
+    - theta_limit: las trayectorias que salen de |theta| <= theta_limit
+      continúan desde el último estado válido con la dinámica no lineal
+      (RK4 del backend activo de `kernels`). None desactiva el cambio.
+    """
+    X0 = np.atleast_2d(np.asarray(x0, dtype=float))
+    n = X0.shape[0]
+    K = _gain(controller)
+    Phi, _ = discretize(M, m, l, g, b, dt, K)
+
+    if method == "powers":
+        powers = _closed_loop_powers(Phi, steps)
+        states = np.matmul(powers, X0.T).transpose(0, 2, 1)
+    elif method == "recursive":
+        states = np.empty((steps + 1, n, 4))
+        states[0] = X0
+        PhiT = Phi.T
+        for k in range(steps):
+            np.matmul(states[k], PhiT, out=states[k + 1])
+    else:
+        raise ValueError(f"Método desconocido: {method}")
+
+    fallback_step = np.full(n, -1)
+    if theta_limit is None:
+        return LinearRollout(states, fallback_step)
+
+    outside = np.abs(states[:, :, 2]) > theta_limit
+    exited = np.flatnonzero(outside.any(axis=0))
+    if exited.size == 0:
+        return LinearRollout(states, fallback_step)
+
+    first = outside[:, exited].argmax(axis=0)
+    fallback_step[exited] = first
+
+    if exited.size < SMALL_BATCH:
+        # Pocas trayectorias: el núcleo escalar evita el coste fijo por paso del lote
+        for i, k0 in zip(exited.tolist(), first.tolist()):
+            k0 = max(k0 - 1, 0)
+            sim = FastPendulumData(M, m, l, g, b, control_func=controller)
+            sim.x, sim.x_dot, sim.theta, sim.theta_dot = states[k0, i].tolist()
+            sim.t = k0 * dt
+            for k in range(k0, steps):
+                sim.next(dt)
+                states[k + 1, i] = (sim.x, sim.x_dot, sim.theta, sim.theta_dot)
+        return LinearRollout(states, fallback_step)
+
+    start = max(int(first.min()) - 1, 0)
+    integrate_batch = get_backend().integrate_batch
+    gain = linear_gain(controller)
+    n_sub, sub_dt = substeps(dt)
+    current = states[start, exited]
+    for k in range(start, steps):
+        integrate_batch(current, n_sub, sub_dt, M, m, l, g, b, *gain)
+        # Las que aún no salieron siguen la trayectoria lineal
+        still_linear = first > k + 1
+        current[still_linear] = states[k + 1, exited[still_linear]]
+        states[k + 1, exited] = current
+    return LinearRollout(states, fallback_step)
+
+
+def linear_error_report(
+    x0,
+    steps: int,
+    dt: float = 0.02,
+    controller=None,
+    M: float = 1.0,
+    m: float = 0.1,
+    l: float = 0.5,
+    g: float = 9.81,
+    b: float = 0.0,
+    theta_limit: Optional[float] = 0.3,
+) -> dict:
+    """Compara `linear_rollout` contra la simulación no lineal (RK4).
+
+    Retorna un dict con el error absoluto máximo y RMS por componente
+    (x, x_dot, theta, theta_dot), el error máximo en theta por trayectoria y
+    la fracción de trayectorias que cambiaron al modelo no lineal.
+    """
+    X0 = np.atleast_2d(np.asarray(x0, dtype=float))
+    lin = linear_rollout(
+        X0, steps, dt, controller, M, m, l, g, b, theta_limit=theta_limit
+    )
+
+    integrate_batch = get_backend().integrate_batch
+    gain = linear_gain(controller)  # linear_rollout ya validó el controlador
+    n_sub, sub_dt = substeps(dt)
+    current = X0.copy()
+    ref = np.empty_like(lin.states)
+    ref[0] = X0
+    for k in range(steps):
+        integrate_batch(current, n_sub, sub_dt, M, m, l, g, b, *gain)
+        ref[k + 1] = current
+
+    err = lin.states - ref
+    # Diferencia angular en [-pi, pi]
+    err[:, :, 2] = (err[:, :, 2] + np.pi) % (2 * np.pi) - np.pi
+    abs_err = np.abs(err)
+    return {
+        "max_abs": abs_err.max(axis=(0, 1)),
+        "rms": np.sqrt((err * err).mean(axis=(0, 1))),
+        "max_abs_theta": abs_err[:, :, 2].max(axis=0),
+        "fallback_fraction": float((lin.fallback_step >= 0).mean()),
+    }
+
+
+class LinearPendulumData(RandomPendulumData):
+    """`RandomPendulumData` con modo lineal opcional cerca de la vertical.
+
+    Mientras |theta| < theta_limit cada subpaso se calcula con las matrices
+    discretas cacheadas de `discretize` en lugar de RK4:
+    - sin controlador o con un controlador lineal (atributo K) la transición
+      es exacta para el modelo lineal y no se llama a `control_func`;
+    - con cualquier otro `control_func` se llama una sola vez por subpaso y F
+      se retiene durante el subpaso;
+    - con `control_period` (ZOH) la fuerza retenida se aplica con Gamma, que
+      es exacto para el modelo lineal.
+    Fuera de esa región (o con linear_mode = False) se integra con RK4 no
+    lineal como `RandomPendulumData`. `linear_steps` / `nonlinear_steps`
+    cuentan los subpasos de cada tipo.
+    """
+
+    # Por defecto en la clase: los snapshots (`from_snapshot`) no pasan por __init__
+    linear_mode = True
+    theta_limit = 0.3
+    _snapshot_settings = RandomPendulumData._snapshot_settings + (
+        "linear_mode",
+        "theta_limit",
+    )
+    linear_steps = 0
+    nonlinear_steps = 0
+    _matrices_key = None
+
+    def __init__(self, *args, theta_limit: float = 0.3, linear_mode: bool = True, **kw):
+        super().__init__(*args, **kw)
+        self.theta_limit = float(theta_limit)
+        self.linear_mode = linear_mode
+
+    def _matrices(self, dt, held=False):
+        """(Phi, Gamma, lazo_cerrado) como listas de floats, memorizadas por instancia.
+
+        held: la fuerza viene retenida de fuera (ZOH), se usa el lazo abierto.
+        """
+        ctrl = None if held else self.control_func
+        key = (dt, ctrl, self.M, self.m, self.l, self.g, self.b)
+        if key != self._matrices_key:
+            K = feedback_gain(ctrl)
+            Phi, Gamma = discretize(self.M, self.m, self.l, self.g, self.b, dt, K)
+            self._matrices_value = (Phi.tolist(), Gamma[:, 0].tolist(), K is not None)
+            self._matrices_key = key
+        return self._matrices_value
+
+    def _rk4_step(self, dt, F=None):
+        if not self.linear_mode or abs(self.theta) >= self.theta_limit:
+            self.nonlinear_steps += 1
+            return super()._rk4_step(dt, F)
+
+        Phi, Gamma, closed_loop = self._matrices(dt, held=F is not None)
+        state = (self.x, self.x_dot, self.theta, self.theta_dot)
+        if F is None:
+            F = (
+                0.0
+                if closed_loop or self.control_func is None
+                else self.control_func(state, self.t)
+            )
+        x, x_dot, theta, theta_dot = state
+        self.x, self.x_dot, self.theta, self.theta_dot = [
+            row[0] * x + row[1] * x_dot + row[2] * theta + row[3] * theta_dot + gam * F
+            for row, gam in zip(Phi, Gamma)
+        ]
+        self.t += dt
+        self.linear_steps += 1
@@ -0,0 +1,201 @@
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+
+# Por debajo de este lote, np.linalg.solve (LAPACK por matriz) sale más barato
+# que la eliminación vectorizada, que paga O(n^3) llamadas a NumPy.
+SMALL_BATCH = 32
+
+
+def solve_spd_batch(A: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Resuelve A x = b para un lote de matrices simétricas definidas positivas.
+
+    Disposición con el lote en el último eje: A (n, n, batch), b (n, batch);
+    así cada coeficiente A[i, k] es un vector contiguo. Eliminación gaussiana
+    sin pivoteo (estable para matrices SPD como la de masas) vectorizada sobre
+    el lote. Sobrescribe A y b.
+    """
+    n = A.shape[0]
+    if A.shape[2] < SMALL_BATCH:
+        A = np.moveaxis(A, 2, 0)
+        return np.linalg.solve(A, b.T[:, :, None])[:, :, 0].T
+
+    for k in range(n):
+        inv_pivot = 1.0 / A[k, k]
+        for i in range(k + 1, n):
+            factor = A[i, k] * inv_pivot
+            A[i, k + 1 :] -= factor * A[k, k + 1 :]
+            b[i] -= factor * b[k]
+    x = np.empty_like(b)
+    for k in range(n - 1, -1, -1):
+        acc = b[k]
+        for j in range(k + 1, n):
+            acc = acc - A[k, j] * x[j]
+        x[k] = acc / A[k, k]
+    return x
+
+
+class MultiLinkPendulumData:
+    """Simulador de péndulo invertido de N eslabones sobre carro, vectorizado.
+
+    Cada eslabón j es una barra uniforme de masa `m[j]` y longitud total
+    `2 * l[j]` (igual que `RandomPendulumData`, donde `l` es la distancia al
+    centro de masa), articulada en el extremo del eslabón anterior. Los ángulos
+    son absolutos respecto a la vertical (0 = arriba). Con un solo eslabón se
+    recuperan las mismas ecuaciones que `RandomPendulumData._derivatives`.
+
+    La dinámica M(q) q_ddot = tau(q, q_dot, F) se resuelve para `batch`
+    instancias a la vez con `solve_spd_batch` sobre matrices (N+1, N+1, batch).
+
+    Estado: array (batch, 2 + 2N) ordenado como
+        [x, x_dot, theta_1, theta_dot_1, ..., theta_N, theta_dot_N]
+    (para N = 1 es el mismo orden que `RandomPendulumData`).
+
+    control_func(state, t) recibe ese array (batch, 2 + 2N) y retorna la fuerza
+    por instancia (escalar o array (batch,)). Si es muestreado (`sampled`,
+    como `SensorActuatorPipeline`) sólo se llama en la primera etapa RK4.
+    """
+
+    def __init__(
+        self,
+        n_links: int = 2,
+        M: float = 1.0,
+        m: Sequence[float] = None,
+        l: Sequence[float] = None,
+        g: float = 9.81,
+        b: float = 0.0,
+        track_half_range: float = 2.0,
+        batch: int = 1,
+        control_func: Optional[Callable[[np.ndarray, float], np.ndarray]] = None,
+    ):
+        n = int(n_links)
+        if n < 1:
+            raise ValueError("n_links debe ser >= 1")
+        self.n_links = n
+        self.M = float(M)
+        self.m = np.broadcast_to(np.asarray(0.1 if m is None else m, float), (n,)).copy()
+        self.l = np.broadcast_to(np.asarray(0.5 if l is None else l, float), (n,)).copy()
+        self.g = float(g)
+        self.b = float(b)
+        self.track_half_range = float(track_half_range)
+        self.batch = int(batch)
+        self.control_func = control_func
+        self._build_coefficients()
+
+        # initial state: small tilt on the first link, like RandomPendulumData
+        self.state = np.zeros((self.batch, 2 + 2 * n))
+        self.state[:, 2] = 0.05
+        self.t = 0.0
+
+    def _build_coefficients(self):
+        """Precalcula los coeficientes constantes de la matriz de masas.
+
+        Para barras uniformes (centro de masa c_j = l_j, longitud L_j = 2 l_j,
+        inercia m_j L_j^2 / 12):
+            a_ij = L_j si j < i, c_i si j == i, 0 si j > i
+            h_j  = sum_i m_i a_ij                      (acoplo carro-eslabón)
+            H_jk = sum_i m_i a_ij a_ik + delta_jk I_j  (acoplo eslabón-eslabón)
+        Entonces M_00 = M + sum m, M_0j = h_j cos(th_j) y
+        M_jk = H_jk cos(th_j - th_k).
+        """
+        n = self.n_links
+        m = self.m
+        c = self.l
+        L = 2.0 * self.l
+        inertia = m * L * L / 12.0
+
+        a = np.zeros((n, n))  # a[i, j]
+        for i in range(n):
+            a[i, :i] = L[:i]
+            a[i, i] = c[i]
+
+        self._h = m @ a
+        self._H = a.T @ (m[:, None] * a) + np.diag(inertia)
+        self._total_mass = self.M + m.sum()
+
+    # ----------------- Dinámica vectorizada -----------------
+    def derivatives(self, state: np.ndarray, F) -> np.ndarray:
+        """Derivada del estado (batch, 2 + 2N) para fuerzas F (escalar o (batch,))."""
+        n = self.n_links
+        batch = state.shape[0]
+        # Lote en el último eje: (N, batch)
+        x_dot = state[:, 1]
+        th = state[:, 2::2].T
+        th_dot = state[:, 3::2].T
+        H = self._H[:, :, None]
+        h = self._h[:, None]
+
+        sin_t = np.sin(th)
+        cos_t = np.cos(th)
+        diff = th[:, None, :] - th[None, :, :]
+
+        mass = np.empty((n + 1, n + 1, batch))
+        mass[0, 0] = self._total_mass
+        mass[0, 1:] = h * cos_t
+        mass[1:, 0] = mass[0, 1:]
+        mass[1:, 1:] = H * np.cos(diff)
+
+        w2 = th_dot * th_dot
+        rhs = np.empty((n + 1, batch))
+        rhs[0] = F - self.b * x_dot + np.sum(h * sin_t * w2, axis=0)
+        rhs[1:] = self.g * h * sin_t - np.sum(H * np.sin(diff) * w2[None], axis=1)
+
+        acc = solve_spd_batch(mass, rhs)
+
+        out = np.empty_like(state)
+        out[:, 0] = x_dot
+        out[:, 1] = acc[0]
+        out[:, 2::2] = th_dot.T
+        out[:, 3::2] = acc[1:].T
+        return out
+
+    def _force(self, state, t):
+        if self.control_func is None:
+            return 0.0
+        return np.asarray(self.control_func(state, t), dtype=float)
+
+    def _rk4_step(self, dt):
+        s0 = self.state
+        t0 = self.t
+        f = self.derivatives
+        F0 = self._force(s0, t0)
+        # Sampled controllers (`sampled`): call at k1 only, hold F for k2..k4
+        held = getattr(self.control_func, "sampled", False)
+        k1 = f(s0, F0)
+        s1 = s0 + 0.5 * dt * k1
+        k2 = f(s1, F0 if held else self._force(s1, t0 + 0.5 * dt))
+        s2 = s0 + 0.5 * dt * k2
+        k3 = f(s2, F0 if held else self._force(s2, t0 + 0.5 * dt))
+        s3 = s0 + dt * k3
+        k4 = f(s3, F0 if held else self._force(s3, t0 + dt))
+        new = s0 + (dt / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
+
+        # Normalize angles to [-pi, pi]
+        new[:, 2::2] = (new[:, 2::2] + np.pi) % (2 * np.pi) - np.pi
+        self.state = new
+        self.t += dt
+
+    def step(self, dt: float = 0.02) -> np.ndarray:
+        """Avanza dt segundos (con subpasos) y retorna el estado (batch, 2 + 2N)."""
+        max_substep = 0.02
+        steps = max(1, int(dt / max_substep))
+        sub_dt = dt / steps
+        for _ in range(steps):
+            self._rk4_step(sub_dt)
+        return self.state
+
+    def next(self, dt: float = 0.02):
+        """Interfaz de `RandomPendulumData.next` para la instancia 0.
+
+        Retorna (x_norm, x_dot, thetas, theta_dots) con tuplas de N ángulos y
+        velocidades angulares (apto para `PendulumWidget.set_state`).
+        """
+        s = self.step(dt)[0]
+        x_norm = min(1.0, max(-1.0, s[0] / self.track_half_range))
+        return x_norm, float(s[1]), tuple(s[2::2].tolist()), tuple(s[3::2].tolist())
+
+    @property
+    def link_ratios(self):
+        """Longitud total de cada eslabón relativa a la suma (para el dibujo)."""
+        return tuple((self.l / self.l.sum()).tolist())
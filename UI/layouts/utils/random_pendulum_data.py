@@ -1,8 +1,170 @@
-from math import sin, cos
-from typing import Callable, Optional, Tuple
+import random
+from math import ceil, sin, cos
+from typing import Any, Callable, NamedTuple, Optional, Sequence, Tuple
 
+import numpy as np
 
-class RandomPendulumData:
+from .kernels import get_backend, linear_gain
+
+
+class PendulumSnapshot(NamedTuple):
+    """Copia inmutable del estado y parámetros de un `RandomPendulumData`.
+
+    Ocupa lo mismo que una tupla de floats; `control_func` se guarda por
+    referencia (no se copia), así que restaurar o bifurcar cuesta O(estado).
+    Los controladores con estado y método `copy()` (`SensorActuatorPipeline`)
+    se copian al bifurcar, con su estado en ese momento; `restore` no lo
+    rebobina.
+    `schedule` guarda el muestreo del controlador digital (ver
+    `RandomPendulumData.set_control_period`) o None si no está activo.
+    `settings` guarda pares (atributo, valor) de los ajustes por instancia
+    que declara la clase en `_snapshot_settings`.
+    """
+
+    x: float
+    x_dot: float
+    theta: float
+    theta_dot: float
+    t: float
+    M: float
+    m: float
+    l: float
+    g: float
+    b: float
+    track_half_range: float
+    control_func: Optional[Callable] = None
+    schedule: Optional[tuple] = None
+    settings: Tuple[Tuple[str, Any], ...] = ()
+
+    @property
+    def state(self) -> Tuple[float, float, float, float]:
+        """Estado (x, x_dot, theta, theta_dot)."""
+        return (self.x, self.x_dot, self.theta, self.theta_dot)
+
+
+class _SnapshotMixin:
+    """Snapshots y bifurcaciones para simuladores con los atributos de
+    `RandomPendulumData` (se comparte con las variantes con `__slots__`)."""
+
+    __slots__ = ()
+
+    # Ajustes por instancia que viajan en el snapshot (`from_snapshot` no pasa
+    # por __init__); las subclases añaden los suyos
+    _snapshot_settings: Tuple[str, ...] = ()
+
+    def snapshot(self) -> PendulumSnapshot:
+        """Congela el estado y los parámetros actuales en un `PendulumSnapshot`."""
+        return PendulumSnapshot(
+            self.x,
+            self.x_dot,
+            self.theta,
+            self.theta_dot,
+            self.t,
+            self.M,
+            self.m,
+            self.l,
+            self.g,
+            self.b,
+            self.track_half_range,
+            self.control_func,
+            self._schedule_state(),
+            tuple((name, getattr(self, name)) for name in self._snapshot_settings),
+        )
+
+    def restore(self, snap: PendulumSnapshot):
+        """Restaura estado, tiempo, parámetros y controlador desde `snap`."""
+        (
+            self.x,
+            self.x_dot,
+            self.theta,
+            self.theta_dot,
+            self.t,
+            self.M,
+            self.m,
+            self.l,
+            self.g,
+            self.b,
+            self.track_half_range,
+            self.control_func,
+        ) = snap[:12]
+        self._restore_schedule(snap.schedule)
+        for name, value in snap.settings:
+            if name in self._snapshot_settings:
+                setattr(self, name, value)
+
+    def _schedule_state(self) -> Optional[tuple]:
+        """Estado del muestreo del controlador para el snapshot (None: sin ZOH)."""
+        return None
+
+    def _restore_schedule(self, schedule: Optional[tuple]):
+        pass
+
+    @classmethod
+    def from_snapshot(cls, snap: PendulumSnapshot):
+        """Crea un simulador nuevo a partir de `snap` sin pasar por `__init__`."""
+        sim = cls.__new__(cls)
+        sim.restore(snap)
+        return sim
+
+    def _own_controller(self):
+        """Sustituye un controlador con estado (con `copy()`) por una copia propia."""
+        copy = getattr(self.control_func, "copy", None)
+        if callable(copy):
+            self.control_func = copy()
+        return self
+
+    def fork(self, snap: Optional[PendulumSnapshot] = None):
+        """Devuelve una copia independiente del simulador (o de `snap` si se da)."""
+        return self.from_snapshot(
+            self.snapshot() if snap is None else snap
+        )._own_controller()
+
+    def fork_batch(
+        self,
+        n: int,
+        snap: Optional[PendulumSnapshot] = None,
+        perturbations: Optional[Sequence[Sequence[float]]] = None,
+        noise_std: Optional[Sequence[float]] = None,
+        seed: Optional[int] = None,
+    ) -> list:
+        """Bifurca un snapshot en `n` simuladores que divergen entre sí.
+
+        - perturbations: n offsets (dx, dx_dot, dtheta, dtheta_dot), uno por rama
+        - noise_std: desviación estándar por componente para offsets gaussianos,
+          generados con `random.Random(seed)` para que sean reproducibles
+
+        Ambas perturbaciones se suman si se pasan juntas.
+        """
+        base = self.snapshot() if snap is None else snap
+        if perturbations is not None and len(perturbations) != n:
+            raise ValueError(
+                f"perturbations tiene {len(perturbations)} filas, se esperaban {n}"
+            )
+        rng = random.Random(seed) if noise_std is not None else None
+
+        forks = []
+        for i in range(n):
+            x, x_dot, theta, theta_dot = base.state
+            if perturbations is not None:
+                dx, dx_dot, dtheta, dtheta_dot = perturbations[i]
+                x += dx
+                x_dot += dx_dot
+                theta += dtheta
+                theta_dot += dtheta_dot
+            if rng is not None:
+                x += rng.gauss(0.0, noise_std[0])
+                x_dot += rng.gauss(0.0, noise_std[1])
+                theta += rng.gauss(0.0, noise_std[2])
+                theta_dot += rng.gauss(0.0, noise_std[3])
+            forks.append(
+                self.from_snapshot(
+                    base._replace(x=x, x_dot=x_dot, theta=theta, theta_dot=theta_dot)
+                )._own_controller()
+            )
+        return forks
+
+
+class RandomPendulumData(_SnapshotMixin):
     """Simulador físico de péndulo invertido con integración RK4.
 
     Parámetros relevantes:
@@ -13,8 +175,19 @@ class RandomPendulumData:
         b: fricción viscosa del carro (N/m/s)
         track_half_range: distancia a cada lado que corresponde a x_norm = +-1 (m)
         control_func: función opcional control_func(state, t) -> F (N)
+        control_period: periodo de muestreo del controlador (s). None (por
+            defecto) evalúa control_func en las cuatro etapas de RK4; con un
+            periodo, el controlador se muestrea con retención de orden cero
+            (ver `set_control_period`)
+        control_delay: retardo de cómputo/transporte de la fuerza (s)
+
+    `max_substep` (atributo, 0.02 s por defecto) es el paso máximo de
+    integración de la planta dentro de `next(dt)`; viaja en los snapshots.
     """
 
+    max_substep = 0.02
+    _snapshot_settings = ("max_substep",)
+
     def __init__(
         self,
         M: float = 1.0,
@@ -26,6 +199,8 @@ class RandomPendulumData:
         control_func: Optional[
             Callable[[Tuple[float, float, float, float], float], float]
         ] = None,
+        control_period: Optional[float] = None,
+        control_delay: float = 0.0,
     ):
         # physical parameters
         self.M = float(M)
@@ -50,6 +225,107 @@ class RandomPendulumData:
         # internal time
         self.t = 0.0
 
+        # digital controller schedule (zero-order hold)
+        self.set_control_period(control_period, control_delay)
+
+    # ----------------- Controlador digital (ZOH) -----------------
+    def set_control_period(self, period: Optional[float], delay: float = 0.0):
+        """Activa (o con None desactiva) el muestreo del controlador con ZOH.
+
+        El controlador se llama una vez por periodo, en t = k * period, y su
+        salida se mantiene constante mientras la planta se integra con
+        subpasos más finos. `delay` se redondea a un número entero de periodos:
+        la fuerza calculada en un disparo se aplica `round(delay / period)`
+        disparos después (cola circular inicializada a 0 N).
+
+        Reinicia la fuerza retenida y el contador `control_calls`.
+        """
+        self.control_calls = 0
+        self.control_times = []
+        if period is None:
+            self._restore_schedule(None)
+            return
+        period = float(period)
+        if period <= 0.0:
+            raise ValueError("control_period debe ser > 0")
+        delay_steps = max(0, int(round(float(delay) / period)))
+        # first firing at the next multiple of the period (t = 0 on a new sim)
+        tick = int(ceil(self.t / period - 1e-9))
+        self._restore_schedule(
+            (period, delay_steps, tick, (0.0,) * (delay_steps + 1), 0, 0.0)
+        )
+
+    def _schedule_state(self) -> Optional[tuple]:
+        if self.control_period is None:
+            return None
+        return (
+            self.control_period,
+            self.control_delay_steps,
+            self._control_tick,
+            tuple(self._control_buffer),
+            self._control_index,
+            self.control_hold,
+        )
+
+    def _restore_schedule(self, schedule: Optional[tuple]):
+        if schedule is None:
+            self.control_period = None
+            self.control_delay_steps = 0
+            self._control_tick = 0
+            self._control_buffer = [0.0]
+            self._control_index = 0
+            self.control_hold = 0.0
+        else:
+            (
+                self.control_period,
+                self.control_delay_steps,
+                self._control_tick,
+                buffer,
+                self._control_index,
+                self.control_hold,
+            ) = schedule
+            self._control_buffer = list(buffer)
+        if not hasattr(self, "control_calls"):
+            self.control_calls = 0
+            self.control_times = []
+
+    def _fire_controller(self):
+        """Muestrea el controlador y actualiza la fuerza retenida (con retardo)."""
+        state = (self.x, self.x_dot, self.theta, self.theta_dot)
+        F = self.control_func(state, self.t)
+        self.control_calls += 1
+        self.control_times.append(self.t)
+
+        # Delay line: write the new sample, hold the oldest one
+        buf = self._control_buffer
+        index = (self._control_index + 1) % len(buf)
+        buf[self._control_index] = F
+        self._control_index = index
+        self.control_hold = buf[index]
+
+    def _advance_sampled(self, dt, max_substep):
+        """Integra dt segundos con el controlador muestreado y retenido."""
+        period = self.control_period
+        eps = 1e-9 * period
+        steps = max(1, int(dt / max_substep))
+        sub_dt = dt / steps
+        remaining = dt
+        # Resync if the schedule fell behind t (controller set late, t moved
+        # by hand): the next firing is the next multiple of the period
+        if self._control_tick * period < self.t - eps:
+            self._control_tick = int(ceil(self.t / period - 1e-9))
+        while remaining > eps:
+            t_fire = self._control_tick * period
+            if self.t >= t_fire - eps:
+                self._fire_controller()
+                self._control_tick += 1
+                t_fire = self._control_tick * period
+            # Split the substep so the next firing lands exactly on t_fire
+            h = min(sub_dt, t_fire - self.t, remaining)
+            assert h > 0.0, "el paso de integración debe ser positivo"
+            self._rk4_step(h, self.control_hold)
+            remaining -= h
+
     def _derivatives(self, state, t, F):
         """Calcula las derivadas (x_dot, x_ddot, theta_dot, theta_ddot)"""
         x, x_dot, theta, theta_dot = state
@@ -80,32 +356,55 @@ class RandomPendulumData:
 
         return (x_dot, x_ddot, theta_dot, theta_ddot)
 
-    def _rk4_step(self, dt):
+    def _rk4_step(self, dt, F=None):
+        """Un paso RK4. Si se pasa F, se mantiene constante en las cuatro etapas
+        (retención de orden cero) y no se llama a control_func.
+
+        Sin controlador o con un `LinearStateFeedback` el paso lo da el backend
+        activo de `kernels` (mismas operaciones, mismo resultado). Un
+        controlador muestreado (`sampled`, como `SensorActuatorPipeline`) se
+        llama sólo en la primera etapa y su fuerza se retiene en las demás.
+        """
+        if F is None:
+            gain = linear_gain(self.control_func)
+            if gain is not None:
+                state = np.array((self.x, self.x_dot, self.theta, self.theta_dot))
+                self.t = get_backend().integrate(
+                    state, self.t, 1, dt, self.M, self.m, self.l, self.g, self.b, *gain
+                )
+                self.x, self.x_dot, self.theta, self.theta_dot = state.tolist()
+                return
+            if getattr(self.control_func, "sampled", False):
+                F = self.control_func(
+                    (self.x, self.x_dot, self.theta, self.theta_dot), self.t
+                )
+
         state0 = (self.x, self.x_dot, self.theta, self.theta_dot)
         t0 = self.t
+        control = self.control_func if F is None else (lambda state, t: F)
 
         # control at t0
-        F0 = self.control_func(state0, t0) if self.control_func is not None else 0.0
+        F0 = control(state0, t0) if control is not None else 0.0
         k1 = self._derivatives(state0, t0, F0)
 
         s1 = tuple(state0[i] + 0.5 * dt * k1[i] for i in range(4))
         F1 = (
-            self.control_func(s1, t0 + 0.5 * dt)
-            if self.control_func is not None
+            control(s1, t0 + 0.5 * dt)
+            if control is not None
             else 0.0
         )
         k2 = self._derivatives(s1, t0 + 0.5 * dt, F1)
 
         s2 = tuple(state0[i] + 0.5 * dt * k2[i] for i in range(4))
         F2 = (
-            self.control_func(s2, t0 + 0.5 * dt)
-            if self.control_func is not None
+            control(s2, t0 + 0.5 * dt)
+            if control is not None
             else 0.0
         )
         k3 = self._derivatives(s2, t0 + 0.5 * dt, F2)
 
         s3 = tuple(state0[i] + dt * k3[i] for i in range(4))
-        F3 = self.control_func(s3, t0 + dt) if self.control_func is not None else 0.0
+        F3 = control(s3, t0 + dt) if control is not None else 0.0
         k4 = self._derivatives(s3, t0 + dt, F3)
 
         new_state = [0.0] * 4
@@ -118,25 +417,34 @@ class RandomPendulumData:
         self.x, self.x_dot, self.theta, self.theta_dot = new_state
         self.t += dt
 
-        # Normalize theta to [-pi, pi] for numerical stability
+        # Normalize theta to [-pi, pi] for numerical stability (skip diverged
+        # values, as the kernels do)
         from math import pi
 
-        while self.theta > pi:
-            self.theta -= 2 * pi
-        while self.theta < -pi:
-            self.theta += 2 * pi
+        if abs(self.theta) < 1e6:
+            while self.theta > pi:
+                self.theta -= 2 * pi
+            while self.theta < -pi:
+                self.theta += 2 * pi
 
     def next(self, dt: float = 0.02):
         """Avanza la simulación dt segundos y retorna (x_norm, x_dot, theta, theta_dot).
 
-        x_norm es x mapeado a [-1,1] usando track_half_range.
+        x_norm es x mapeado a [-1,1] usando track_half_range. Con
+        `control_period`, `control_times` queda con los instantes en que se
+        disparó el controlador durante este paso.
         """
         # Integrate (we may substep for stability if dt is large)
-        max_substep = 0.02
-        steps = max(1, int(dt / max_substep))
-        sub_dt = dt / steps
-        for _ in range(steps):
-            self._rk4_step(sub_dt)
+        max_substep = self.max_substep
+        if self.control_period is not None and self.control_func is not None:
+            # Firing times of this tick only
+            self.control_times = []
+            self._advance_sampled(dt, max_substep)
+        else:
+            steps = max(1, int(dt / max_substep))
+            sub_dt = dt / steps
+            for _ in range(steps):
+                self._rk4_step(sub_dt)
 
         # Convert to normalized position
         x_norm = self.x / self.track_half_range
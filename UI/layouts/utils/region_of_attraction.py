@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .fast_pendulum_data import FastPendulumData
+from .kernels import feedback_gain, get_backend, linear_gain, substeps
+from .multilink_pendulum_data import MultiLinkPendulumData
+
+# Etiquetas de cada celda del mapa
+ROA_FAILED = 0
+ROA_RECOVERED = 1
+ROA_UNDECIDED = 2  # ni convergió ni cayó dentro del horizonte
+
+# Subir al cambiar la simulación o los criterios: invalida la caché
+_CACHE_VERSION = 4
+
+
+class RoaMap(NamedTuple):
+    """Mapa de región de atracción sobre (theta, theta_dot) con x = x_dot = 0.
+
+    label: array (len(theta_dot), len(theta)) con ROA_FAILED / ROA_RECOVERED /
+        ROA_UNDECIDED (filas = theta_dot, columnas = theta)
+    simulated: nº de celdas simuladas (el resto se rellenó por refinamiento)
+    elapsed: segundos de cómputo (0 si vino de la caché)
+    """
+
+    theta: np.ndarray
+    theta_dot: np.ndarray
+    label: np.ndarray
+    simulated: int
+    elapsed: float
+
+
+def controller_key(controller) -> str:
+    """Identificador estable de un controlador para la caché.
+
+    Usa la ganancia `K` de los controladores lineales (ver `feedback_gain`)
+    o un atributo `cache_key` si existe; en otro caso el nombre calificado
+    (pasa `cache_key` explícito a `roa_map` para clausuras con parámetros).
+    """
+    K = feedback_gain(controller)
+    if K is not None:
+        return f"{type(controller).__name__}:{K.tolist()!r}"
+    key = getattr(controller, "cache_key", None)
+    if key is not None:
+        return str(key)
+    return f"{getattr(controller, '__module__', '')}.{getattr(controller, '__qualname__', repr(controller))}"
+
+
+def simulate_cells(
+    initial: np.ndarray,
+    controller: Callable,
+    params: Dict[str, float],
+    horizon: float = 10.0,
+    dt: float = 0.02,
+    settle_tol: float = 0.05,
+    theta_fail: float = np.pi / 2,
+    batch_size: int = 16384,
+    compact_every: int = 10,
+) -> np.ndarray:
+    """Simula condiciones iniciales (n, 4) en lotes y retorna su etiqueta (n,).
+
+    Una celda termina antes del horizonte si converge (todas las componentes
+    del estado por debajo de `settle_tol`) o si falla (|theta| > theta_fail o
+    el carro sale de +-track_half_range). Cada `compact_every` pasos el lote se
+    compacta quitando las celdas terminadas, salvo con controladores con
+    estado por celda (con `reset()`, como `SensorActuatorPipeline`): ésos se
+    reinician en cada lote y lo simulan completo.
+
+    Sin controlador o con un `LinearStateFeedback` el lote se integra con
+    `get_backend().integrate_batch`; cualquier otro `controller(state, t)`
+    debe aceptar un array (batch, 4) y se simula con `MultiLinkPendulumData`
+    de un eslabón.
+    """
+    params = dict(params)
+    track = float(params.pop("track_half_range", 2.0))
+    steps = int(round(horizon / dt))
+    labels = np.full(len(initial), ROA_UNDECIDED, dtype=np.int8)
+
+    gain = linear_gain(controller)
+    if gain is not None:
+        backend = get_backend()
+        ref = FastPendulumData(**params)  # parámetros con sus valores por defecto
+        physics = (ref.M, ref.m, ref.l, ref.g, ref.b)
+        n_sub, sub_dt = substeps(dt)
+    stateful = gain is None and callable(getattr(controller, "reset", None))
+
+    for lo in range(0, len(initial), batch_size):
+        index = np.arange(lo, min(lo + batch_size, len(initial)))
+        state = np.array(initial[index], dtype=float)
+        live = np.ones(len(index), dtype=bool)
+        if gain is None:
+            if stateful:
+                controller.reset()
+            sim = MultiLinkPendulumData(
+                n_links=1, batch=len(index), control_func=controller, **params
+            )
+        done = 0
+        while done < steps:
+            chunk = min(compact_every, steps - done)
+            if gain is None:
+                sim.state = state
+                for _ in range(chunk):
+                    state = sim.step(dt)
+            else:
+                backend.integrate_batch(state, chunk * n_sub, sub_dt, *physics, *gain)
+            done += chunk
+
+            failed = (np.abs(state[:, 2]) > theta_fail) | (np.abs(state[:, 0]) > track)
+            settled = np.abs(state).max(axis=1) < settle_tol
+            failed &= live
+            settled &= live & ~failed
+            labels[index[failed]] = ROA_FAILED
+            labels[index[settled]] = ROA_RECOVERED
+            live &= ~(failed | settled)
+            if not live.any():
+                break
+            if not stateful and not live.all():
+                index = index[live]
+                state = state[live]
+                live = live[live]
+    return labels
+
+
+def _cache_path(cache_dir: str, meta: dict) -> str:
+    digest = hashlib.sha1(json.dumps(meta, sort_keys=True).encode()).hexdigest()
+    return os.path.join(cache_dir, f"roa_{digest[:16]}.npz")
+
+
+def roa_map(
+    controller: Callable,
+    params: Optional[Dict[str, float]] = None,
+    resolution: int = 512,
+    theta_range: Tuple[float, float] = (-np.pi / 2, np.pi / 2),
+    theta_dot_range: Tuple[float, float] = (-4.0, 4.0),
+    horizon: float = 10.0,
+    dt: float = 0.02,
+    coarse_stride: int = 8,
+    cache_dir: Optional[str] = "roa_cache",
+    cache_key: Optional[str] = None,
+    **sim_kw,
+) -> RoaMap:
+    """Mapa de región de atracción de `controller` en una rejilla resolution².
+
+    - params: parámetros físicos de `RandomPendulumData` (M, m, l, g, b,
+      track_half_range); los que falten toman sus valores por defecto
+    - coarse_stride: se simula primero cada `coarse_stride` celdas; los bloques
+      cuyas esquinas (y bloques vecinos) coinciden se rellenan sin simular y el
+      resto se refina a la mitad de paso hasta llegar a 1. Con 1 se simula la
+      rejilla completa
+    - cache_dir: carpeta de la caché en disco (None la desactiva); la clave es
+      un hash de controlador, parámetros, rejilla y criterios
+    - sim_kw: se pasa a `simulate_cells` (settle_tol, theta_fail, batch_size)
+    """
+    params = dict(params or {})
+    theta = np.linspace(theta_range[0], theta_range[1], resolution)
+    theta_dot = np.linspace(theta_dot_range[0], theta_dot_range[1], resolution)
+
+    meta = {
+        "version": _CACHE_VERSION,
+        "controller": cache_key or controller_key(controller),
+        "params": {k: float(v) for k, v in params.items()},
+        "resolution": int(resolution),
+        "theta_range": [float(v) for v in theta_range],
+        "theta_dot_range": [float(v) for v in theta_dot_range],
+        "horizon": float(horizon),
+        "dt": float(dt),
+        "coarse_stride": int(coarse_stride),
+        "sim_kw": {k: float(v) for k, v in sim_kw.items()},
+    }
+    path = _cache_path(cache_dir, meta) if cache_dir else None
+    if path and os.path.exists(path):
+        with np.load(path) as data:
+            return RoaMap(theta, theta_dot, data["label"], int(data["simulated"]), 0.0)
+
+    start = time.perf_counter()
+    n = resolution
+    label = np.zeros((n, n), dtype=np.int8)  # [i_theta_dot, j_theta]
+    known = np.zeros((n, n), dtype=bool)
+    simulated = 0
+
+    def evaluate(rows, cols):
+        nonlocal simulated
+        mask = ~known[np.ix_(rows, cols)]
+        ii, jj = np.nonzero(mask)
+        if ii.size == 0:
+            return
+        r, c = rows[ii], cols[jj]
+        initial = np.zeros((r.size, 4))
+        initial[:, 2] = theta[c]
+        initial[:, 3] = theta_dot[r]
+        label[r, c] = simulate_cells(initial, controller, params, horizon, dt, **sim_kw)
+        known[r, c] = True
+        simulated += r.size
+
+    stride = max(1, int(coarse_stride))
+    while True:
+        idx = np.unique(np.append(np.arange(0, n, stride), n - 1))
+        evaluate(idx, idx)
+        if stride == 1:
+            break
+
+        # Bloques entre muestras consecutivas: uniformes si sus 4 esquinas
+        # coinciden; se exige también que los 8 bloques vecinos lo sean
+        C = label[np.ix_(idx, idx)]
+        uniform = (
+            (C[:-1, :-1] == C[1:, :-1])
+            & (C[:-1, :-1] == C[:-1, 1:])
+            & (C[:-1, :-1] == C[1:, 1:])
+        )
+        pad = np.pad(~uniform, 1)
+        mixed = np.zeros_like(uniform)
+        for di in (0, 1, 2):
+            for dj in (0, 1, 2):
+                mixed |= pad[di : di + uniform.shape[0], dj : dj + uniform.shape[1]]
+
+        block = np.clip(np.searchsorted(idx, np.arange(n), side="right") - 1, 0, len(idx) - 2)
+        fill = ~mixed[np.ix_(block, block)] & ~known
+        corner = C[:-1, :-1][np.ix_(block, block)]
+        label[fill] = corner[fill]
+        known |= fill
+        stride //= 2
+
+    elapsed = time.perf_counter() - start
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(
+            tmp, label=label, simulated=simulated, meta=json.dumps(meta, sort_keys=True)
+        )
+        os.replace(tmp, path)
+    return RoaMap(theta, theta_dot, label, simulated, elapsed)
@@ -0,0 +1,344 @@
+import copy
+from math import exp, floor, sqrt
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+
+class NoiseBlock:
+    """Fuente de ruido gaussiano N(0, 1) pre-generado por bloques.
+
+    Cada bloque son `block` muestras de forma `shape` sacadas de un
+    `np.random.Generator` con semilla, así que la secuencia es reproducible y
+    cada muestra cuesta un slice en lugar de una llamada al generador. Con
+    lotes grandes el bloque se acorta para no pasar de `max_elements`.
+    """
+
+    def __init__(
+        self,
+        shape,
+        seed: Optional[int] = None,
+        block: int = 1024,
+        max_elements: int = 1 << 20,
+    ):
+        self.shape = tuple(shape)
+        size = int(np.prod(self.shape))
+        self.block = max(1, min(int(block), max_elements // max(1, size)))
+        self.rng = np.random.default_rng(seed)
+        self._buffer = None
+        self._index = self.block
+
+    def draw(self) -> np.ndarray:
+        if self._index >= self.block:
+            self._buffer = self.rng.standard_normal((self.block,) + self.shape)
+            self._index = 0
+        sample = self._buffer[self._index]
+        self._index += 1
+        return sample
+
+
+class Stage:
+    """Etapa de la cadena sensor/actuador.
+
+    `process(x)` recibe un array (batch, n) por muestra y retorna otro del
+    mismo tamaño. El estado interno se crea en la primera muestra (así una
+    etapa sirve para cualquier lote), `reset()` lo descarta y `copy()` retorna
+    una etapa independiente con el mismo estado. `period` lo asigna
+    `SensorActuatorPipeline` antes de la primera muestra.
+    """
+
+    period = None
+
+    def setup(self, period: float):
+        self.period = period
+
+    def reset(self):
+        pass
+
+    def copy(self) -> "Stage":
+        # Incluye el generador de ruido: la copia sigue la misma secuencia
+        return copy.deepcopy(self)
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+def _active_columns(values, n: int):
+    """Índices de las componentes con valor no nulo y esos valores."""
+    values = np.broadcast_to(np.asarray(values, dtype=float), (n,))
+    cols = np.flatnonzero(values)
+    return cols, values[cols]
+
+
+class Quantize(Stage):
+    """Cuantización al múltiplo más cercano de `step`.
+
+    `step` es por componente; 0 deja la componente sin cuantizar.
+    """
+
+    def __init__(self, step):
+        self.step = np.asarray(step, dtype=float)
+        self._cols = None
+
+    @classmethod
+    def encoder(cls, counts_per_rev: int = 2400, x_resolution: float = 1e-4):
+        """Encoders típicos del banco: ángulo con `counts_per_rev` cuentas por
+        vuelta y carro con `x_resolution` m por cuenta (velocidades sin cuantizar)."""
+        return cls([x_resolution, 0.0, 2 * np.pi / counts_per_rev, 0.0])
+
+    def process(self, x):
+        if self._cols is None or self._n != x.shape[1]:
+            self._n = x.shape[1]
+            self._cols, self._steps = _active_columns(self.step, self._n)
+        out = x.copy()
+        out[:, self._cols] = np.round(x[:, self._cols] / self._steps) * self._steps
+        return out
+
+
+class GaussianNoise(Stage):
+    """Ruido blanco gaussiano aditivo con desviación `std` por componente.
+
+    Sólo se genera ruido para las componentes con std no nula.
+    """
+
+    def __init__(self, std, seed: Optional[int] = None, block: int = 1024):
+        self.std = np.asarray(std, dtype=float)
+        self.seed = seed
+        self.block = block
+        self._noise = None
+
+    def reset(self):
+        self._noise = None
+
+    def _draw(self, x):
+        """Muestra de ruido N(0, std) para las columnas activas, forma (batch, k)."""
+        if self._noise is None or self._shape != x.shape:
+            self._shape = x.shape
+            self._cols, self._std = _active_columns(self.std, x.shape[1])
+            self._noise = NoiseBlock(
+                (x.shape[0], len(self._cols)), self.seed, self.block
+            )
+        return self._std * self._noise.draw()
+
+    def _add(self, x, noise):
+        if len(self._cols) == x.shape[1]:
+            return x + noise
+        out = x.copy()
+        # Column by column: cheaper than a fancy-indexed add for a few columns
+        for j, col in enumerate(self._cols):
+            out[:, col] += noise[:, j]
+        return out
+
+    def process(self, x):
+        return self._add(x, self._draw(x))
+
+
+class ColoredNoise(GaussianNoise):
+    """Ruido coloreado AR(1) (paso bajo de primer orden) con constante `tau`.
+
+    n[k] = a n[k-1] + sqrt(1 - a^2) std w[k], a = exp(-period / tau), de modo
+    que la desviación estacionaria es `std` y la autocorrelación decae con tau.
+    """
+
+    def __init__(
+        self, std, tau: float, seed: Optional[int] = None, block: int = 1024
+    ):
+        super().__init__(std, seed, block)
+        self.tau = float(tau)
+        self._state = None
+
+    def reset(self):
+        super().reset()
+        self._state = None
+
+    def _draw(self, x):
+        if self._noise is None or self._shape != x.shape:
+            # Nuevo lote: el filtro vuelve a la distribución estacionaria
+            self._state = None
+        return super()._draw(x)
+
+    def process(self, x):
+        w = self._draw(x)
+        if self._state is None:
+            # Start from the stationary distribution
+            self._state = w
+        else:
+            a = exp(-self.period / self.tau)
+            self._state = a * self._state + sqrt(1.0 - a * a) * w
+        return self._add(x, self._state)
+
+
+class SampleHold(Stage):
+    """Retiene cada valor durante `every` muestras (sensor más lento)."""
+
+    def __init__(self, every: int):
+        self.every = max(1, int(every))
+        self._count = 0
+        self._held = None
+
+    def reset(self):
+        self._count = 0
+        self._held = None
+
+    def process(self, x):
+        if self._count % self.every == 0 or self._held is None:
+            self._held = x.copy()
+        self._count += 1
+        return self._held
+
+
+class Saturation(Stage):
+    """Recorta a [-limit, limit] (p. ej. fuerza máxima del actuador, N)."""
+
+    def __init__(self, limit):
+        self.limit = np.asarray(limit, dtype=float)
+
+    def process(self, x):
+        return np.clip(x, -self.limit, self.limit)
+
+
+class RateLimit(Stage):
+    """Limita la variación a `max_rate` unidades/s (p. ej. N/s)."""
+
+    def __init__(self, max_rate, initial: float = 0.0):
+        self.max_rate = np.asarray(max_rate, dtype=float)
+        self.initial = initial
+        self._last = None
+
+    def reset(self):
+        self._last = None
+
+    def process(self, x):
+        if self._last is None:
+            self._last = np.full_like(x, self.initial)
+        max_step = self.max_rate * self.period
+        self._last = self._last + np.clip(x - self._last, -max_step, max_step)
+        return self._last
+
+
+class Delay(Stage):
+    """Línea de retardo de `samples` muestras en una cola circular.
+
+    Hasta llenarse la cola retorna `initial` (None: la primera muestra).
+    """
+
+    def __init__(self, samples: int, initial: Optional[float] = None):
+        self.samples = max(0, int(samples))
+        self.initial = initial
+        self._buffer = None
+        self._index = 0
+
+    def reset(self):
+        self._buffer = None
+        self._index = 0
+
+    def process(self, x):
+        if self.samples == 0:
+            return x
+        if self._buffer is None:
+            fill = x if self.initial is None else np.full_like(x, self.initial)
+            self._buffer = np.repeat(fill[None], self.samples, axis=0)
+        out = self._buffer[self._index].copy()
+        self._buffer[self._index] = x
+        self._index = (self._index + 1) % self.samples
+        return out
+
+
+class SensorActuatorPipeline:
+    """Cadena sensor -> control_func -> actuador, usable como `control_func`.
+
+    Muestrea a `period` segundos: en t = k * period el estado pasa por las
+    etapas `sensors`, llega a `control_func` y la fuerza pasa por `actuators`;
+    entre muestras (p. ej. en las etapas intermedias de RK4) se retorna la
+    fuerza retenida. Con `RandomPendulumData(control_period=period)` el
+    controlador se llama exactamente una vez por muestra.
+
+    `sampled = True` pide a los simuladores que la llamen sólo al inicio de
+    cada paso RK4, con el estado real, y retengan la fuerza en las etapas
+    intermedias: así la muestra de t = k * period no sale del estado predicho
+    de la última etapa del paso anterior.
+
+    Acepta el estado escalar (tupla de 4, retorna float, y `control_func`
+    recibe una tupla) o un lote (batch, n) como `MultiLinkPendulumData`
+    (retorna (batch,), y `control_func` recibe el array).
+
+    La cadena tiene estado (muestra y fuerza retenidas, retardos, ruido), así
+    que no debe compartirse entre simuladores: `fork`/`fork_batch` dan a cada
+    rama su propia `copy()`. Si cambia el tamaño del lote, la cadena se
+    reinicia (`reset()`) y toma una muestra nueva.
+
+    Ejemplo:
+        pipeline = SensorActuatorPipeline(
+            ctrl,
+            period=0.01,
+            sensors=[Quantize.encoder(), GaussianNoise([0, 0.01, 0, 0.02], seed=1)],
+            actuators=[Saturation(10.0), RateLimit(200.0), Delay(2)],
+        )
+        sim = RandomPendulumData(control_func=pipeline, control_period=0.01)
+    """
+
+    def __init__(
+        self,
+        control_func: Callable,
+        period: float = 0.02,
+        sensors: Sequence[Stage] = (),
+        actuators: Sequence[Stage] = (),
+    ):
+        self.control_func = control_func
+        self.period = float(period)
+        self.sensors = list(sensors)
+        self.actuators = list(actuators)
+        for stage in self.sensors + self.actuators:
+            stage.setup(self.period)
+        self.reset()
+
+    sampled = True
+
+    def reset(self):
+        """Reinicia el estado de todas las etapas y la fuerza retenida."""
+        for stage in self.sensors + self.actuators:
+            stage.reset()
+        self._sample = None
+        self._output = 0.0
+
+    def copy(self) -> "SensorActuatorPipeline":
+        """Cadena independiente con el mismo estado (etapas y fuerza retenida).
+
+        `control_func` se copia si tiene `copy()`; si no, se comparte.
+        """
+        new = copy.copy(self)
+        new.sensors = [stage.copy() for stage in self.sensors]
+        new.actuators = [stage.copy() for stage in self.actuators]
+        inner = getattr(self.control_func, "copy", None)
+        if callable(inner):
+            new.control_func = inner()
+        if isinstance(self._output, np.ndarray):
+            new._output = self._output.copy()
+        return new
+
+    def __call__(self, state, t=0.0):
+        k = int(floor(t / self.period + 1e-9))
+        batched = isinstance(state, np.ndarray) and state.ndim > 1
+        shape = (len(state),) if batched else ()
+        if np.shape(self._output) != shape:
+            # Batch size changed (e.g. compaction): per-row state is stale
+            if self._sample is not None:
+                self.reset()
+        elif k == self._sample:
+            return self._output
+        self._sample = k
+
+        y = np.array(state, dtype=float, ndmin=2)
+        for stage in self.sensors:
+            y = stage.process(y)
+
+        if batched:
+            F = self.control_func(y, t)
+        else:
+            F = self.control_func(tuple(y[0].tolist()), t)
+
+        u = np.array(F, dtype=float).reshape(-1, 1)
+        for stage in self.actuators:
+            u = stage.process(u)
+        self._output = u[:, 0] if batched else float(u[0, 0])
+        return self._output
@@ -0,0 +1,358 @@
+import asyncio
+import base64
+import hashlib
+import socket
+import struct
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Cabecera de cada lote: magic, nº de columnas, secuencia de la 1ª muestra, nº muestras.
+# Le siguen n * n_cols float64 little-endian (t, x_norm, x_dot, theta, theta_dot).
+BATCH_MAGIC = b"IPT1"
+BATCH_HEADER = struct.Struct("<4sHQI")
+TELEMETRY_COLUMNS = ("t", "x_norm", "x_dot", "theta", "theta_dot")
+
+_WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def encode_batch(first_seq: int, samples: np.ndarray) -> bytes:
+    """Empaqueta un lote (n, n_cols) de muestras en un mensaje binario."""
+    samples = np.ascontiguousarray(samples, dtype="<f8")
+    n, n_cols = samples.shape
+    return BATCH_HEADER.pack(BATCH_MAGIC, n_cols, first_seq, n) + samples.tobytes()
+
+
+def decode_batch(payload: bytes) -> Tuple[int, np.ndarray]:
+    """Inverso de `encode_batch`: retorna (secuencia de la 1ª muestra, array)."""
+    magic, n_cols, first_seq, n = BATCH_HEADER.unpack_from(payload)
+    if magic != BATCH_MAGIC:
+        raise ValueError("Mensaje de telemetría no reconocido")
+    data = np.frombuffer(payload, dtype="<f8", offset=BATCH_HEADER.size)
+    return first_seq, data.reshape(n, n_cols)
+
+
+def _ws_frame(payload: bytes, opcode: int = 0x2) -> bytes:
+    """Trama WebSocket del servidor (FIN, sin máscara)."""
+    n = len(payload)
+    if n < 126:
+        header = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return header + payload
+
+
+class _Client:
+    """Estado de un visor conectado: cola acotada y contadores."""
+
+    def __init__(
+        self,
+        writer: asyncio.StreamWriter,
+        protocol: str,
+        queue_size: int,
+        last_sent_seq: int,
+    ):
+        self.writer = writer
+        self.protocol = protocol
+        self.peer = writer.get_extra_info("peername")
+        self.queue: deque = deque(maxlen=queue_size)
+        self.wakeup = asyncio.Event()
+        self.sent_batches = 0
+        self.dropped_batches = 0
+        # Al conectar se cuenta como al día: el retraso mide sólo lo publicado después
+        self.last_sent_seq = last_sent_seq
+        self.task = asyncio.current_task()
+
+    def enqueue(self, last_seq: int, message: bytes):
+        # deque(maxlen) descarta el más antiguo: un visor lento nunca frena al lazo
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped_batches += 1
+        self.queue.append((last_seq, message))
+        self.wakeup.set()
+
+    def frame(self, message: bytes) -> bytes:
+        if self.protocol == "ws":
+            return _ws_frame(message)
+        return struct.pack("<I", len(message)) + message
+
+
+class TelemetryServer:
+    """Servidor local que difunde el estado en vivo a varios visores.
+
+    `publish()` se llama desde el lazo de control (hilo de Qt) y sólo añade la
+    muestra a una lista protegida por un lock. Un bucle asyncio en su propio
+    hilo agrupa las muestras cada `batch_interval` segundos en un mensaje
+    binario (ver `encode_batch`) y lo encola para cada cliente en una cola de
+    `queue_size` lotes que descarta el más antiguo cuando se llena.
+
+    Protocolos:
+        - TCP en `port`: cada mensaje va precedido de su longitud (uint32 LE)
+        - WebSocket en `ws_port` (opcional): un mensaje binario por lote
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        ws_port: Optional[int] = 8766,
+        queue_size: int = 64,
+        batch_interval: float = 0.02,
+        columns: Tuple[str, ...] = TELEMETRY_COLUMNS,
+    ):
+        self.host = host
+        self.port = port
+        self.ws_port = ws_port
+        self.queue_size = int(queue_size)
+        self.batch_interval = float(batch_interval)
+        self.columns = tuple(columns)
+
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[float, ...]] = []
+        self._next_seq = 0  # secuencia de la próxima muestra publicada
+        self._first_pending_seq = 0
+
+        self._clients: List[_Client] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._servers: list = []
+        self._stopping: Optional[asyncio.Event] = None
+        self._started = threading.Event()
+        self._start_error: Optional[BaseException] = None
+
+    # ----------------- API del lazo de control -----------------
+    def publish(self, *sample: float):
+        """Publica una muestra (t, x_norm, x_dot, theta, theta_dot). No bloquea."""
+        if self._thread is None:
+            return
+        with self._lock:
+            self._pending.append(sample)
+            self._next_seq += 1
+
+    def start(self):
+        """Arranca el hilo del servidor; relanza el error si no puede escuchar."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="telemetry-server", daemon=True
+        )
+        self._thread.start()
+        self._started.wait()
+        if self._start_error is not None:
+            self._thread.join()
+            self._thread = None
+            raise self._start_error
+
+    def stop(self):
+        """Cierra las conexiones y detiene el hilo del servidor."""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join()
+        self._thread = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """(host, puerto TCP) real; útil con port=0."""
+        return self._servers[0].sockets[0].getsockname()[:2]
+
+    @property
+    def ws_address(self) -> Optional[Tuple[str, int]]:
+        if len(self._servers) < 2:
+            return None
+        return self._servers[1].sockets[0].getsockname()[:2]
+
+    def client_stats(self) -> List[Dict]:
+        """Retraso y pérdidas por cliente.
+
+        `lag_samples` es cuántas muestras publicadas no le han llegado todavía
+        a ese cliente (incluye las descartadas por contrapresión).
+        """
+        latest = self._next_seq - 1
+        return [
+            {
+                "peer": c.peer,
+                "protocol": c.protocol,
+                "sent_batches": c.sent_batches,
+                "dropped_batches": c.dropped_batches,
+                "queued_batches": len(c.queue),
+                "lag_samples": latest - c.last_sent_seq,
+            }
+            for c in list(self._clients)
+        ]
+
+    # ----------------- Hilo asyncio -----------------
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._main())
+        except BaseException as exc:
+            if not self._started.is_set():
+                self._start_error = exc
+        finally:
+            self._started.set()
+            self._loop.close()
+
+    async def _main(self):
+        self._stopping = asyncio.Event()
+        self._servers.append(
+            await asyncio.start_server(self._handle_tcp, self.host, self.port)
+        )
+        if self.ws_port is not None:
+            self._servers.append(
+                await asyncio.start_server(self._handle_ws, self.host, self.ws_port)
+            )
+        self._started.set()
+
+        flusher = asyncio.create_task(self._flush_loop())
+        await self._stopping.wait()
+
+        flusher.cancel()
+        for server in self._servers:
+            server.close()
+        tasks = [client.task for client in self._clients]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.batch_interval)
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            pending = self._pending
+            first_seq = self._first_pending_seq
+            self._pending = []
+            self._first_pending_seq = self._next_seq
+
+        if not self._clients:
+            return
+        message = encode_batch(first_seq, np.array(pending, dtype=np.float64))
+        last_seq = first_seq + len(pending) - 1
+        for client in self._clients:
+            client.enqueue(last_seq, message)
+
+    async def _serve(self, client: _Client, reader: asyncio.StreamReader):
+        self._clients.append(client)
+        reader_task = asyncio.create_task(self._watch_reader(client, reader))
+        waiter = None
+        try:
+            while not reader_task.done():
+                if not client.queue:
+                    client.wakeup.clear()
+                    waiter = asyncio.create_task(client.wakeup.wait())
+                    await asyncio.wait(
+                        {waiter, reader_task}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    waiter.cancel()
+                    continue
+                last_seq, message = client.queue.popleft()
+                client.writer.write(client.frame(message))
+                await client.writer.drain()
+                client.sent_batches += 1
+                client.last_sent_seq = last_seq
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            # CancelledError: stop() cierra el servidor con clientes conectados
+            pass
+        finally:
+            # stop() puede cancelar durante asyncio.wait: cancelar también waiter
+            if waiter is not None:
+                waiter.cancel()
+            reader_task.cancel()
+            self._clients.remove(client)
+            client.writer.close()
+
+    async def _watch_reader(self, client: _Client, reader: asyncio.StreamReader):
+        """Termina cuando el cliente cierra la conexión."""
+        try:
+            if client.protocol == "ws":
+                while True:
+                    head = await reader.readexactly(2)
+                    opcode = head[0] & 0x0F
+                    n = head[1] & 0x7F
+                    if n == 126:
+                        (n,) = struct.unpack("!H", await reader.readexactly(2))
+                    elif n == 127:
+                        (n,) = struct.unpack("!Q", await reader.readexactly(8))
+                    masked = head[1] & 0x80
+                    await reader.readexactly(n + (4 if masked else 0))
+                    if opcode == 0x8:  # close
+                        return
+            else:
+                while await reader.read(4096):
+                    pass
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            return
+
+    def _new_client(self, writer, protocol: str) -> _Client:
+        with self._lock:
+            last_seq = self._next_seq - 1
+        return _Client(writer, protocol, self.queue_size, last_seq)
+
+    async def _handle_tcp(self, reader, writer):
+        await self._serve(self._new_client(writer, "tcp"), reader)
+
+    async def _handle_ws(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+
+        key = None
+        for line in request.split(b"\r\n")[1:]:
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"sec-websocket-key":
+                key = value.strip()
+        if key is None:
+            writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            writer.close()
+            return
+
+        accept = base64.b64encode(hashlib.sha1(key + _WS_GUID).digest())
+        writer.write(
+            b"HTTP/1.1 101 Switching Protocols\r\n"
+            b"Upgrade: websocket\r\n"
+            b"Connection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+        await self._serve(self._new_client(writer, "ws"), reader)
+
+
+class TelemetryClient:
+    """Cliente TCP bloqueante para `TelemetryServer` (scripts, pruebas, registro)."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+
+    def _recv_exact(self, n: int) -> bytes:
+        buf = bytearray()
+        while len(buf) < n:
+            chunk = self.sock.recv(n - len(buf))
+            if not chunk:
+                raise ConnectionError("Conexión cerrada por el servidor")
+            buf += chunk
+        return bytes(buf)
+
+    def read_batch(self) -> Tuple[int, np.ndarray]:
+        """Espera el siguiente lote: (secuencia de la 1ª muestra, array (n, cols))."""
+        (size,) = struct.unpack("<I", self._recv_exact(4))
+        return decode_batch(self._recv_exact(size))
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
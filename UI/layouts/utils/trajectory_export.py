@@ -0,0 +1,304 @@
+import gzip
+import queue
+import threading
+import zipfile
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Columnas por defecto: lo mismo que devuelve `next()` más el tiempo
+TRAJECTORY_COLUMNS = ("t", "x_norm", "x_dot", "theta", "theta_dot")
+
+
+class TrajectoryWriter:
+    """Escritor de trayectorias por bloques con memoria constante.
+
+    Las muestras se copian a bloques preasignados de `chunk_size` filas. Cada
+    bloque lleno se entrega a un hilo de fondo que lo comprime y escribe, y
+    vuelve a un pool de `max_pending + 1` bloques. Si el disco va más lento que
+    el productor, `write()` se bloquea esperando un bloque libre en lugar de
+    acumular memoria.
+
+    - decimate: guarda una de cada `decimate` muestras (1 = todas)
+
+    Las subclases implementan `_open`, `_write_chunk` y `_close`, que se
+    ejecutan siempre en el hilo de escritura.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        columns: Sequence[str] = TRAJECTORY_COLUMNS,
+        chunk_size: int = 65536,
+        decimate: int = 1,
+        max_pending: int = 2,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size debe ser >= 1")
+        if decimate < 1:
+            raise ValueError("decimate debe ser >= 1")
+
+        self.path = path
+        self.columns = tuple(columns)
+        self.chunk_size = int(chunk_size)
+        self.decimate = int(decimate)
+        self.samples_written = 0
+
+        ncols = len(self.columns)
+        self._free = queue.Queue()
+        for _ in range(max_pending + 1):
+            self._free.put(np.empty((self.chunk_size, ncols), dtype=np.float64))
+        self._pending = queue.Queue(maxsize=max_pending)
+
+        self._chunk = self._free.get()
+        self._fill = 0
+        self._skip = 0
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        self._thread = threading.Thread(
+            target=self._run, name="trajectory-writer", daemon=True
+        )
+        self._thread.start()
+
+    # ----------------- API del productor -----------------
+    def write(self, sample: Sequence[float]):
+        """Añade una muestra (una fila con un valor por columna)."""
+        if self._skip:
+            self._skip -= 1
+            return
+        self._skip = self.decimate - 1
+
+        self._chunk[self._fill] = sample
+        self._fill += 1
+        if self._fill == self.chunk_size:
+            self._flush()
+
+    def write_many(self, samples):
+        """Añade un bloque de muestras (array 2D o iterable de filas)."""
+        if not isinstance(samples, np.ndarray):
+            for sample in samples:
+                self.write(sample)
+            return
+
+        rows = samples[self._skip :: self.decimate]
+        self._skip = (self._skip - len(samples)) % self.decimate
+        while len(rows):
+            n = min(len(rows), self.chunk_size - self._fill)
+            self._chunk[self._fill : self._fill + n] = rows[:n]
+            self._fill += n
+            rows = rows[n:]
+            if self._fill == self.chunk_size:
+                self._flush()
+
+    def close(self):
+        """Escribe el bloque parcial, espera al hilo y cierra el fichero."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._fill and self._error is None:
+            self._flush(last=True)
+        self._pending.put(None)
+        self._thread.join()
+        self._raise_pending_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _flush(self, last: bool = False):
+        self._raise_pending_error()
+        self._pending.put((self._chunk, self._fill))
+        self.samples_written += self._fill
+        self._fill = 0
+        self._chunk = None if last else self._free.get()
+
+    def _raise_pending_error(self):
+        if self._error is not None:
+            raise RuntimeError(f"Error escribiendo {self.path}") from self._error
+
+    # ----------------- Hilo de escritura -----------------
+    def _run(self):
+        try:
+            self._open()
+            while True:
+                item = self._pending.get()
+                if item is None:
+                    break
+                chunk, n = item
+                self._write_chunk(chunk[:n])
+                self._free.put(chunk)
+        except BaseException as exc:  # se relanza en el hilo productor
+            self._error = exc
+            # Liberar al productor si está esperando un bloque
+            self._free.put(
+                np.empty((self.chunk_size, len(self.columns)), dtype=np.float64)
+            )
+            # Vaciar la cola hasta el centinela de close()
+            while self._pending.get() is not None:
+                pass
+        finally:
+            try:
+                self._close()
+            except BaseException as exc:
+                if self._error is None:
+                    self._error = exc
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _write_chunk(self, chunk: np.ndarray):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+class CsvTrajectoryWriter(TrajectoryWriter):
+    """CSV con cabecera; se comprime con gzip si la ruta termina en `.gz`."""
+
+    def __init__(self, path: str, *args, fmt: str = "%.17g", **kwargs):
+        self.fmt = fmt
+        self._fh = None
+        super().__init__(path, *args, **kwargs)
+
+    def _open(self):
+        if self.path.endswith(".gz"):
+            self._fh = gzip.open(self.path, "wt", newline="")
+        else:
+            self._fh = open(self.path, "w", newline="")
+        self._fh.write(",".join(self.columns) + "\n")
+
+    def _write_chunk(self, chunk):
+        np.savetxt(self._fh, chunk, fmt=self.fmt, delimiter=",")
+
+    def _close(self):
+        if self._fh is not None:
+            self._fh.close()
+
+
+class NpzTrajectoryWriter(TrajectoryWriter):
+    """NPZ comprimido escrito por bloques (`chunk_000000`, `chunk_000001`, ...).
+
+    Es un `.npz` normal (se puede abrir con `np.load`); para leerlo sin cargarlo
+    entero en memoria usa `iter_npz_trajectory`.
+    """
+
+    def __init__(self, path: str, *args, compresslevel: int = 6, **kwargs):
+        self.compresslevel = compresslevel
+        self._zip = None
+        self._index = 0
+        super().__init__(path, *args, **kwargs)
+
+    def _open(self):
+        self._zip = zipfile.ZipFile(
+            self.path,
+            "w",
+            compression=zipfile.ZIP_DEFLATED,
+            compresslevel=self.compresslevel,
+            allowZip64=True,
+        )
+        self._write_array("columns", np.array(self.columns))
+
+    def _write_chunk(self, chunk):
+        self._write_array(f"chunk_{self._index:06d}", chunk)
+        self._index += 1
+
+    def _write_array(self, name, array):
+        with self._zip.open(name + ".npy", "w", force_zip64=True) as fh:
+            np.lib.format.write_array(fh, np.ascontiguousarray(array))
+
+    def _close(self):
+        if self._zip is not None:
+            self._zip.close()
+
+
+class ParquetTrajectoryWriter(TrajectoryWriter):
+    """Parquet (un row group por bloque). Requiere `pyarrow`."""
+
+    def __init__(self, path: str, *args, compression: str = "zstd", **kwargs):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as exc:
+            raise ImportError(
+                "ParquetTrajectoryWriter necesita pyarrow (pip install pyarrow)"
+            ) from exc
+
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.compression = compression
+        self._writer = None
+        super().__init__(path, *args, **kwargs)
+
+    def _open(self):
+        schema = self._pa.schema([(c, self._pa.float64()) for c in self.columns])
+        self._writer = self._pq.ParquetWriter(
+            self.path, schema, compression=self.compression
+        )
+
+    def _write_chunk(self, chunk):
+        table = self._pa.table(
+            {c: chunk[:, i].copy() for i, c in enumerate(self.columns)}
+        )
+        self._writer.write_table(table)
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_trajectory_writer(path: str, **kwargs) -> TrajectoryWriter:
+    """Elige el escritor según la extensión (.csv, .csv.gz, .npz, .parquet)."""
+    lower = path.lower()
+    if lower.endswith(".csv") or lower.endswith(".csv.gz"):
+        return CsvTrajectoryWriter(path, **kwargs)
+    if lower.endswith(".npz"):
+        return NpzTrajectoryWriter(path, **kwargs)
+    if lower.endswith(".parquet"):
+        return ParquetTrajectoryWriter(path, **kwargs)
+    raise ValueError(f"Formato de trayectoria no soportado: {path}")
+
+
+def export_trajectory(samples: Iterable[Sequence[float]], path: str, **kwargs) -> int:
+    """Consume un flujo de muestras y lo escribe en `path`.
+
+    Acepta cualquier iterable de filas (simulador, sesión serie, replay) o de
+    arrays 2D. Retorna el número de muestras escritas tras la decimación.
+    """
+    with open_trajectory_writer(path, **kwargs) as writer:
+        for item in samples:
+            if isinstance(item, np.ndarray) and item.ndim == 2:
+                writer.write_many(item)
+            else:
+                writer.write(item)
+    return writer.samples_written
+
+
+def simulate_trajectory(
+    sim, steps: int, dt: float = 0.02
+) -> Iterator[Tuple[float, float, float, float, float]]:
+    """Genera (t, x_norm, x_dot, theta, theta_dot) avanzando `sim` con `next(dt)`."""
+    for _ in range(steps):
+        x_norm, x_dot, theta, theta_dot = sim.next(dt)
+        yield (sim.t, x_norm, x_dot, theta, theta_dot)
+
+
+def iter_npz_trajectory(path: str) -> Iterator[np.ndarray]:
+    """Lee un NPZ de `NpzTrajectoryWriter` bloque a bloque."""
+    with np.load(path) as data:
+        names = sorted(n for n in data.files if n.startswith("chunk_"))
+        for name in names:
+            yield data[name]
+
+
+def load_npz_trajectory(path: str) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """Carga un NPZ de `NpzTrajectoryWriter` completo: (columnas, array 2D)."""
+    with np.load(path) as data:
+        columns = tuple(str(c) for c in data["columns"])
+    chunks = list(iter_npz_trajectory(path))
+    if not chunks:
+        return columns, np.empty((0, len(columns)))
+    return columns, np.concatenate(chunks)
@@ -0,0 +1,300 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from multiprocessing import get_context
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FRAME_PATTERN = "frame_%06d.png"
+SEGMENT_PATTERN = "segment_%06d.gif"
+GIF_SEGMENT = 64  # cuadros por segmento GIF: acota la memoria de Pillow
+
+# Códec de ffmpeg por extensión (el resto usa libx264)
+_FFMPEG_CODECS = {
+    ".webm": ["-c:v", "libvpx-vp9", "-crf", "32", "-b:v", "0"],
+}
+_FFMPEG_DEFAULT_CODEC = ["-c:v", "libx264"]
+
+
+def resample_trajectory(
+    t: Sequence[float],
+    cart_pos: Sequence[float],
+    theta: Sequence[float],
+    fps: float = 30.0,
+    speed: float = 1.0,
+) -> np.ndarray:
+    """Interpola la trayectoria a una rejilla de `fps` cuadros por segundo de vídeo.
+
+    - speed: factor de velocidad de reproducción (2.0 = el doble de rápido)
+
+    Retorna un array (n_frames, 2) con columnas (cart_pos, theta). theta se
+    desenrolla antes de interpolar para no barrer el círculo al cruzar +-pi.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    if t.size == 0:
+        return np.empty((0, 2))
+    frame_dt = speed / fps
+    frame_t = np.arange(t[0], t[-1] + 0.5 * frame_dt, frame_dt)
+    frames = np.empty((frame_t.size, 2))
+    frames[:, 0] = np.interp(frame_t, t, np.asarray(cart_pos, dtype=np.float64))
+    frames[:, 1] = np.interp(frame_t, t, np.unwrap(np.asarray(theta, dtype=np.float64)))
+    return frames
+
+
+def gif_palette(colors: Sequence[str], levels: int = 6) -> List[int]:
+    """Paleta fija (lista plana de 768 enteros) para los GIF.
+
+    Contiene `colors` (hex "#rrggbb") y `levels` mezclas intermedias entre cada
+    par, que son los tonos que deja el antialiasing. Al ser la misma en todos
+    los cuadros, cada proceso puede paletizar y codificar sus cuadros solo.
+    """
+    rgb = [tuple(int(c[i : i + 2], 16) for i in (1, 3, 5)) for c in colors]
+    palette = list(rgb)
+    for a, b in combinations(rgb, 2):
+        for k in range(1, levels + 1):
+            f = k / (levels + 1)
+            palette.append(tuple(round(a[i] + (b[i] - a[i]) * f) for i in range(3)))
+    if len(palette) > 256:
+        raise ValueError("La paleta GIF no cabe en 256 colores")
+    palette += [(0, 0, 0)] * (256 - len(palette))
+    return [v for color in palette for v in color]
+
+
+def _render_frames(args) -> int:
+    """Worker: pinta los cuadros [start, start + len(frames)).
+
+    Con fmt="png" escribe un PNG por cuadro; con fmt="gif" paletiza cada
+    cuadro con `gif_palette` y escribe segmentos GIF de `GIF_SEGMENT` cuadros
+    que `_encode_gif` concatena.
+    """
+    out_dir, start, frames, size, widget_kwargs, fmt, fps = args
+
+    # Sin pantalla en los procesos hijos: usar la plataforma offscreen de Qt
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtGui import QGuiApplication, QImage, QPainter, QColor
+
+    from .IP import DRACULA, draw_pendulum
+
+    app = QGuiApplication.instance() or QGuiApplication([])  # noqa: F841
+
+    if fmt == "gif":
+        from PIL import Image
+
+        palette = Image.new("P", (1, 1))
+        palette.putpalette(gif_palette(list(DRACULA.values())))
+        segment = []
+
+        def flush(first):
+            segment[0].save(
+                os.path.join(out_dir, SEGMENT_PATTERN % first),
+                save_all=True,
+                append_images=segment[1:],
+                duration=int(round(1000.0 / fps)),
+                loop=0,
+                optimize=False,
+            )
+            segment.clear()
+
+    w, h = size
+    image = QImage(w, h, QImage.Format.Format_RGB32)
+    background = QColor(DRACULA["bg"])
+    for i, (cart_pos, theta) in enumerate(frames):
+        image.fill(background)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        draw_pendulum(painter, w, h, cart_pos, theta, **widget_kwargs)
+        painter.end()
+        if fmt != "gif":
+            image.save(os.path.join(out_dir, FRAME_PATTERN % (start + i)), "PNG", 80)
+            continue
+        # RGB32 en memoria es BGRX (little endian)
+        rgb = Image.frombuffer(
+            "RGB", (w, h), bytes(image.constBits()), "raw", "BGRX", image.bytesPerLine(), 1
+        )
+        segment.append(rgb.quantize(palette=palette, dither=Image.Dither.NONE))
+        if len(segment) == GIF_SEGMENT:
+            flush(start + i + 1 - GIF_SEGMENT)
+    if fmt == "gif" and segment:
+        flush(start + len(frames) - len(segment))
+    return len(frames)
+
+
+def render_frames(
+    frames: np.ndarray,
+    out_dir: str,
+    size: Tuple[int, int] = (640, 440),
+    workers: Optional[int] = None,
+    fmt: str = "png",
+    fps: float = 30.0,
+    **widget_kwargs,
+) -> int:
+    """Pinta todos los cuadros en `out_dir` repartiéndolos entre procesos.
+
+    Cada proceso recibe un rango contiguo de cuadros. `fmt` es "png" (un PNG
+    por cuadro) o "gif" (segmentos GIF ya codificados a `fps`).
+    `widget_kwargs` se pasa a `draw_pendulum` (cart_width, rod_length_ratio, ...).
+    """
+    n = len(frames)
+    if n == 0:
+        return 0
+    workers = max(1, min(workers or os.cpu_count() or 1, n))
+    bounds = np.linspace(0, n, workers + 1).astype(int)
+    jobs = [
+        (out_dir, int(a), frames[a:b], tuple(size), widget_kwargs, fmt, fps)
+        for a, b in zip(bounds[:-1], bounds[1:])
+        if b > a
+    ]
+    if workers == 1:
+        return sum(_render_frames(job) for job in jobs)
+
+    # spawn: los hijos no heredan el estado de Qt del proceso principal
+    with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as pool:
+        return sum(pool.map(_render_frames, jobs))
+
+
+def _gif_blocks(data: bytes):
+    """Separa un GIF en (cabecera, [(tipo, bloque), ...]).
+
+    La cabecera incluye la tabla de color global; tipo es la etiqueta de la
+    extensión (0xF9 control, 0xFF aplicación, ...) o 0x2C para una imagen.
+    """
+    flags = data[10]
+    pos = 13 + (3 << ((flags & 7) + 1) if flags & 0x80 else 0)
+    header, blocks = data[:pos], []
+
+    def skip_sub_blocks(pos):
+        while data[pos]:
+            pos += data[pos] + 1
+        return pos + 1
+
+    while data[pos] != 0x3B:
+        start = pos
+        if data[pos] == 0x21:
+            kind = data[pos + 1]
+            pos = skip_sub_blocks(pos + 2)
+        elif data[pos] == 0x2C:
+            kind = 0x2C
+            flags = data[pos + 9]
+            pos += 10 + (3 << ((flags & 7) + 1) if flags & 0x80 else 0)
+            pos = skip_sub_blocks(pos + 1)  # tras el tamaño mínimo de código LZW
+        else:
+            raise ValueError(f"Bloque GIF inesperado: 0x{data[pos]:02x}")
+        blocks.append((kind, data[start:pos]))
+    return header, blocks
+
+
+def _encode_gif(frame_dir: str, path: str):
+    """Concatena los segmentos GIF de los workers en un único GIF.
+
+    Todos comparten la paleta global, así que basta copiar los cuadros (control
+    + imagen) de cada segmento; en memoria sólo hay un segmento a la vez.
+    """
+    segments = sorted(f for f in os.listdir(frame_dir) if f.endswith(".gif"))
+    header = None
+    with open(path, "wb") as out:
+        for name in segments:
+            with open(os.path.join(frame_dir, name), "rb") as f:
+                seg_header, blocks = _gif_blocks(f.read())
+            if header is None:
+                header = seg_header
+                out.write(header)
+                # Mantener la extensión de bucle (NETSCAPE) del primer segmento
+                out.writelines(b for kind, b in blocks if kind == 0xFF)
+            elif seg_header[13:] != header[13:]:
+                raise RuntimeError("Los segmentos GIF no comparten la paleta")
+            out.writelines(b for kind, b in blocks if kind in (0xF9, 0x2C))
+        out.write(b"\x3b")
+
+
+def _encode_ffmpeg(frame_dir: str, path: str, fps: float, ffmpeg: str):
+    cmd = [
+        ffmpeg,
+        "-y",
+        "-loglevel",
+        "error",
+        "-framerate",
+        f"{fps:g}",
+        "-i",
+        os.path.join(frame_dir, FRAME_PATTERN),
+        *_FFMPEG_CODECS.get(os.path.splitext(path)[1].lower(), _FFMPEG_DEFAULT_CODEC),
+        "-pix_fmt",
+        "yuv420p",
+        path,
+    ]
+    subprocess.run(cmd, check=True)
+
+
+def export_video(
+    path: str,
+    t: Sequence[float],
+    cart_pos: Sequence[float],
+    theta: Sequence[float],
+    fps: float = 30.0,
+    speed: float = 1.0,
+    size: Tuple[int, int] = (640, 440),
+    workers: Optional[int] = None,
+    **widget_kwargs,
+) -> int:
+    """Exporta una trayectoria como vídeo sin pasar por la pantalla.
+
+    El formato se elige por `path`:
+        - `.gif`: GIF animado con Pillow; cada proceso paletiza y codifica sus
+          cuadros, pero el GIF sigue siendo varias veces más lento y pesado que
+          MP4 (mejor para clips cortos)
+        - `.mp4` / `.mkv` (H.264) / `.webm` (VP9): requiere `ffmpeg` en el PATH
+        - cualquier otra ruta: directorio con la secuencia de PNG
+
+    Retorna el número de cuadros exportados.
+    """
+    frames = resample_trajectory(t, cart_pos, theta, fps=fps, speed=speed)
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext in ("", ".png"):
+        out_dir = path[: -len(ext)] if ext else path
+        os.makedirs(out_dir, exist_ok=True)
+        return render_frames(frames, out_dir, size, workers, fps=fps, **widget_kwargs)
+
+    ffmpeg = None
+    if ext != ".gif":
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError(
+                f"No se encontró ffmpeg para exportar {ext}; usa .gif o un directorio"
+            )
+
+    fmt = "gif" if ffmpeg is None else "png"
+    with tempfile.TemporaryDirectory(prefix="pendulum_frames_") as frame_dir:
+        n = render_frames(
+            frames, frame_dir, size, workers, fmt, fps, **widget_kwargs
+        )
+        if n == 0:
+            raise ValueError("La trayectoria está vacía")
+        if ffmpeg is None:
+            _encode_gif(frame_dir, path)
+        else:
+            _encode_ffmpeg(frame_dir, path, fps, ffmpeg)
+    return n
+
+
+def export_npz_video(npz_path: str, path: str, **kwargs) -> int:
+    """Exporta un NPZ de `NpzTrajectoryWriter` (columnas t, x_norm, theta)."""
+    from .utils.trajectory_export import load_npz_trajectory
+
+    columns, data = load_npz_trajectory(npz_path)
+    col = {name: i for i, name in enumerate(columns)}
+    return export_video(
+        path, data[:, col["t"]], data[:, col["x_norm"]], data[:, col["theta"]], **kwargs
+    )
+
+
+# Uso: python -m layouts.video_export run.npz run.mp4  (desde la carpeta UI)
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python -m layouts.video_export <trayectoria.npz> <salida>")
+        sys.exit(1)
+    print(f"{export_npz_video(sys.argv[1], sys.argv[2])} cuadros exportados")
@@ -0,0 +1,106 @@
+"""`TelemetryServer` con un visor rápido y otro que no lee.
+
+Uso (desde la carpeta UI):
+    python -m pytest tests
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from layouts.utils.telemetry import (  # noqa: E402
+    TELEMETRY_COLUMNS,
+    TelemetryClient,
+    TelemetryServer,
+)
+
+BURSTS = 400
+BURST = 1000  # muestras por ráfaga (~40 kB)
+
+
+def _wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timeout")
+        time.sleep(0.002)
+
+
+def _stats_by_peer(server):
+    return {s["peer"]: s for s in server.client_stats()}
+
+
+def test_fast_client_lossless_slow_client_drops():
+    server = TelemetryServer(port=0, ws_port=0, queue_size=4, batch_interval=0.005)
+    server.start()
+    fast = slow = late = None
+    try:
+        host, port = server.address
+        fast = TelemetryClient(host, port)
+        slow = TelemetryClient(host, port)  # nunca lee
+        _wait_for(lambda: len(server.client_stats()) == 2)
+
+        received = []
+        count = [0]
+
+        def read_fast():
+            while count[0] < BURSTS * BURST:
+                first_seq, batch = fast.read_batch()
+                received.append((first_seq, batch))
+                count[0] += len(batch)
+
+        reader = threading.Thread(target=read_fast, daemon=True)
+        reader.start()
+
+        # Cada muestra lleva su secuencia en la columna t para comprobar el orden
+        worst_burst = 0.0
+        seq = 0
+        for b in range(BURSTS):
+            start = time.perf_counter()
+            for _ in range(BURST):
+                server.publish(float(seq), 0.1, 0.2, 0.3, 0.4)
+                seq += 1
+            worst_burst = max(worst_burst, time.perf_counter() - start)
+            # Sólo el visor rápido marca el ritmo; el lento no puede frenar
+            _wait_for(lambda: count[0] >= (b + 1) * BURST)
+        reader.join(5.0)
+
+        fast_peer = fast.sock.getsockname()[:2]
+        slow_peer = slow.sock.getsockname()[:2]
+        _wait_for(lambda: _stats_by_peer(server)[fast_peer]["lag_samples"] == 0)
+        stats = _stats_by_peer(server)
+
+        # Visor rápido: todo, en orden y sin pérdidas
+        assert stats[fast_peer]["dropped_batches"] == 0
+        assert stats[fast_peer]["lag_samples"] == 0
+        expected = 0
+        for first_seq, batch in received:
+            assert first_seq == expected
+            assert batch.shape[1] == len(TELEMETRY_COLUMNS)
+            np.testing.assert_array_equal(
+                batch[:, 0], np.arange(first_seq, first_seq + len(batch))
+            )
+            expected += len(batch)
+        assert expected == BURSTS * BURST
+
+        # Visor que no lee: sólo pierde lotes; el lazo de control no se bloquea
+        assert stats[slow_peer]["dropped_batches"] > 0
+        assert stats[slow_peer]["lag_samples"] > 0
+        assert stats[slow_peer]["queued_batches"] <= 4
+        assert worst_burst < 0.5
+
+        # Un visor nuevo no hereda el retraso de lo publicado antes de conectar
+        late = TelemetryClient(host, port)
+        late_peer = late.sock.getsockname()[:2]
+        _wait_for(lambda: late_peer in _stats_by_peer(server))
+        assert _stats_by_peer(server)[late_peer]["lag_samples"] == 0
+    finally:
+        for client in (fast, slow, late):
+            if client is not None:
+                client.close()
+        server.stop()